@@ -0,0 +1,268 @@
+import json
+import time
+import atexit
+import smtplib
+import threading
+import http.client
+from collections import deque, Counter
+from email.mime.text import MIMEText
+from urllib.parse import urlsplit
+
+# Event yang masuk dalam jendela ini digabung menjadi satu digest (detik)
+DEFAULT_WINDOW = 5.0
+
+# Batas jumlah alert yang dikirim per menit; sisanya digabung ke digest berikutnya
+DEFAULT_MAX_PER_MINUTE = 10
+
+# Jumlah baris detail maksimum dalam satu digest
+MAX_DETAILS = 50
+
+ALERT_SUBJECT = 'Security Alert - File Integrity Monitor'
+ALERT_FROM = 'monitor@example.com'
+ALERT_TO = 'admin@example.com'
+
+
+class ConsoleTransport:
+    """Kirim alert dengan print ke konsol (perilaku lama)"""
+    name = "console"
+
+    def send(self, subject, message, events):
+        print("\n" + "="*60)
+        print("⚠️  SECURITY ALERT ⚠️")
+        print(message)
+        print("="*60 + "\n")
+
+    def close(self):
+        pass
+
+
+class SmtpTransport:
+    """Kirim alert lewat SMTP; koneksi dipakai ulang antar pengiriman"""
+    name = "smtp"
+
+    def __init__(self, host="localhost", port=25, sender=ALERT_FROM, recipient=ALERT_TO):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.recipient = recipient
+        self._smtp = None
+
+    def _connect(self):
+        if self._smtp is None:
+            self._smtp = smtplib.SMTP(self.host, self.port, timeout=30)
+        return self._smtp
+
+    def send(self, subject, message, events):
+        msg = MIMEText(message)
+        msg['Subject'] = subject
+        msg['From'] = self.sender
+        msg['To'] = self.recipient
+
+        try:
+            self._connect().send_message(msg)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            # Koneksi lama bisa sudah ditutup server; coba sekali lagi dengan koneksi baru
+            self._smtp = None
+            self._connect().send_message(msg)
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._smtp = None
+
+
+class WebhookTransport:
+    """Kirim alert sebagai JSON POST ke webhook; koneksi HTTP keep-alive dipakai ulang"""
+    name = "webhook"
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.url = url
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            self._connection = connection_class(self.host, self.port, timeout=30)
+        return self._connection
+
+    def _post(self, body):
+        connection = self._connect()
+        connection.request("POST", self.path, body=body, headers={'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        response.read()
+        if response.status >= 400:
+            raise RuntimeError(f"webhook returned HTTP {response.status}")
+
+    def send(self, subject, message, events):
+        body = json.dumps({
+            'subject': subject,
+            'message': message,
+            'events': [{'type': title, 'file': detail} for title, detail in events]
+        }).encode('utf-8')
+
+        try:
+            self._post(body)
+        except (http.client.HTTPException, OSError):
+            self.close()
+            self._post(body)
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def create_transport(spec):
+    """Buat transport dari spesifikasi: 'console', 'smtp://host:port', atau URL http(s)"""
+    if spec in (None, "", "console"):
+        return ConsoleTransport()
+
+    parts = urlsplit(spec)
+    if parts.scheme == "smtp":
+        return SmtpTransport(parts.hostname or "localhost", parts.port or 25)
+    if parts.scheme in ("http", "https"):
+        return WebhookTransport(spec)
+    raise ValueError(f"Unknown alert transport: {spec} (use console, smtp://host:port or http(s)://url)")
+
+
+def format_digest(events):
+    """Susun pesan digest dari list (title, detail)"""
+    if len(events) == 1:
+        title, detail = events[0]
+        return f"{title}: {detail}"
+
+    lines = [f"{len(events)} security events detected"]
+    for title, count in Counter(title for title, _ in events).most_common():
+        lines.append(f"  {title}: {count}")
+
+    lines.append("")
+    for title, detail in events[:MAX_DETAILS]:
+        lines.append(f"  - {title}: {detail}")
+    if len(events) > MAX_DETAILS:
+        lines.append(f"  ... and {len(events) - MAX_DETAILS} more")
+    return "\n".join(lines)
+
+
+class AlertPipeline:
+    """Kumpulkan alert di background thread dan kirim sebagai digest dengan batas laju.
+
+    Event yang masuk digabung sampai batch ditutup (end_batch, misalnya di akhir
+    satu pengecekan) atau jendela waktu habis. Jika batas per menit tercapai,
+    event tidak dibuang tetapi ikut digest berikutnya.
+    """
+
+    def __init__(self, transport, window=DEFAULT_WINDOW, max_per_minute=DEFAULT_MAX_PER_MINUTE):
+        self.transport = transport
+        self.window = window
+        self.max_per_minute = max_per_minute
+
+        self._condition = threading.Condition()
+        self._events = []
+        self._first_event = None
+        self._batch_done = False
+        self._stopping = False
+        self._sent_times = deque()
+
+        self._thread = threading.Thread(target=self._run, name=f"alerts:{transport.name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, title, detail):
+        """Antrekan satu event alert (tidak memblok pemindaian)"""
+        with self._condition:
+            self._events.append((title, detail))
+            if self._first_event is None:
+                self._first_event = time.monotonic()
+                self._condition.notify()
+
+    def end_batch(self):
+        """Tandai akhir satu pengecekan agar digest segera dikirim"""
+        with self._condition:
+            if self._events:
+                self._batch_done = True
+                self._condition.notify()
+
+    def close(self):
+        """Kirim sisa event (tanpa batas laju) lalu hentikan thread"""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        self._thread.join()
+        self.transport.close()
+
+    def _rate_wait(self):
+        """Berapa detik harus menunggu sebelum boleh mengirim lagi (0 jika boleh)"""
+        now = time.monotonic()
+        while self._sent_times and now - self._sent_times[0] >= 60:
+            self._sent_times.popleft()
+        if len(self._sent_times) < self.max_per_minute:
+            return 0
+        return 60 - (now - self._sent_times[0])
+
+    def _next_digest(self):
+        """Tunggu sampai ada digest yang boleh dikirim; None jika pipeline berhenti"""
+        with self._condition:
+            while True:
+                if self._stopping:
+                    break
+                if self._events:
+                    elapsed = time.monotonic() - self._first_event
+                    if self._batch_done or elapsed >= self.window:
+                        wait = self._rate_wait()
+                        if wait <= 0:
+                            break
+                    else:
+                        wait = self.window - elapsed
+                    self._condition.wait(wait)
+                else:
+                    self._condition.wait()
+
+            events, self._events = self._events, []
+            self._first_event = None
+            self._batch_done = False
+            if events:
+                self._sent_times.append(time.monotonic())
+            return events, self._stopping
+
+    def _run(self):
+        while True:
+            events, stopping = self._next_digest()
+            if events:
+                subject = ALERT_SUBJECT if len(events) == 1 else f"{ALERT_SUBJECT} ({len(events)} events)"
+                try:
+                    self.transport.send(subject, format_digest(events), events)
+                except Exception as e:
+                    print(f"Failed to send alert via {self.transport.name}: {str(e)}")
+            if stopping:
+                return
+
+
+_pipelines = {}
+_pipelines_lock = threading.Lock()
+
+
+def get_alert_pipeline(spec="console"):
+    """Ambil pipeline bersama untuk satu transport (satu thread per transport per proses)"""
+    key = spec or "console"
+    with _pipelines_lock:
+        pipeline = _pipelines.get(key)
+        if pipeline is None:
+            pipeline = _pipelines[key] = AlertPipeline(create_transport(key))
+        return pipeline
+
+
+@atexit.register
+def close_all_pipelines():
+    """Kirim digest yang tersisa saat proses berhenti"""
+    with _pipelines_lock:
+        pipelines = list(_pipelines.values())
+        _pipelines.clear()
+    for pipeline in pipelines:
+        pipeline.close()
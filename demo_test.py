@@ -5,9 +5,13 @@ Otomatis membuat file test dan melakukan simulasi serangan
 """
 
 import os
+import json
 import time
 import random
+import shutil
 import string
+import platform
+import subprocess
 from pathlib import Path
 
 class DemoTester:
@@ -154,6 +158,236 @@ class DemoTester:
                 print(f"🗑️  Deleted: {file.name}")
         
         print(f"\n✅ Total {count} files cleaned")
+    
+    # ------------------------------------------------------------------
+    # Benchmark: tree sintetis yang bisa direproduksi dan skenario mutasi
+    # ------------------------------------------------------------------
+    
+    def _tree_path(self, index, layout):
+        """Tentukan path relatif file ke-index sesuai layout"""
+        if layout == "flat":
+            return f"file_{index:07d}.dat"
+        if layout == "deep":
+            # Pohon bercabang 4 dengan 50 file per direktori; makin banyak file makin dalam
+            node = index // 50
+            parts = []
+            while node:
+                parts.append(f"d{node % 4}")
+                node //= 4
+            return os.path.join(*parts, f"file_{index:07d}.dat") if parts else f"file_{index:07d}.dat"
+        # wide: banyak direktori sejajar, masing-masing maksimal 1000 file
+        return os.path.join(f"dir_{index // 1000:04d}", f"file_{index:07d}.dat")
+    
+    def _file_size(self, rng, size_profile):
+        """Pilih ukuran file berdasarkan profil distribusi ukuran"""
+        if size_profile == "small":
+            return rng.randint(64, 4096)
+        roll = rng.random()
+        if roll < 0.90:
+            return rng.randint(64, 4096)
+        if roll < 0.99:
+            return rng.randint(64 * 1024, 1024 * 1024)
+        return rng.randint(1024 * 1024, 16 * 1024 * 1024)
+    
+    def _write_sized(self, filepath, size, block, offset):
+        """Tulis file berukuran size dengan isi diambil berulang dari block"""
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        with open(filepath, 'wb') as f:
+            written = 0
+            while written < size:
+                start = (offset + written) % len(block)
+                chunk = block[start:start + min(size - written, len(block) - start)]
+                f.write(chunk)
+                written += len(chunk)
+    
+    def generate_tree(self, file_count=1000, layout="wide", size_profile="small",
+                      large_files=0, large_size_mb=2048, seed=42):
+        """Buat tree sintetis yang bisa direproduksi (seed sama -> tree sama)"""
+        if layout not in BENCH_LAYOUTS:
+            raise ValueError(f"Unknown layout: {layout} (choose from {', '.join(BENCH_LAYOUTS)})")
+        if size_profile not in BENCH_SIZE_PROFILES:
+            raise ValueError(f"Unknown size profile: {size_profile} (choose from {', '.join(BENCH_SIZE_PROFILES)})")
+        
+        print("\n" + "="*60)
+        print(f"🌲 Generating {file_count} files ({layout} layout, {size_profile} sizes, seed {seed})")
+        print("="*60)
+        
+        rng = random.Random(seed)
+        block = rng.randbytes(1024 * 1024)
+        total_bytes = 0
+        
+        for index in range(file_count):
+            size = self._file_size(rng, size_profile)
+            self._write_sized(self.test_folder / self._tree_path(index, layout), size, block, index * 7919)
+            total_bytes += size
+        
+        # File raksasa (multi-GB) untuk menguji jalur hashing file besar
+        for index in range(large_files):
+            size = large_size_mb * 1024 * 1024
+            self._write_sized(self.test_folder / "large" / f"large_{index}.bin", size, block, index)
+            total_bytes += size
+        
+        print(f"✅ Created {file_count + large_files} files, {total_bytes / (1024 * 1024):.1f} MB")
+        return {'files': file_count + large_files, 'bytes': total_bytes}
+    
+    def mutate_tree(self, scenario="sparse", seed=42):
+        """Terapkan skenario mutasi, kembalikan jumlah perubahan yang diharapkan"""
+        if scenario not in BENCH_SCENARIOS:
+            raise ValueError(f"Unknown scenario: {scenario} (choose from {', '.join(BENCH_SCENARIOS)})")
+        
+        rng = random.Random(seed + 1)
+        files = sorted(str(p.relative_to(self.test_folder)) for p in self.test_folder.rglob("*") if p.is_file())
+        
+        # sparse: 0.1% file diubah; mass: 50% (ransomware); churn: 5% dihapus, 5% baru, 5% diubah
+        modify_ratio, delete_ratio, create_ratio = {
+            "sparse": (0.001, 0, 0),
+            "mass": (0.5, 0, 0),
+            "churn": (0.05, 0.05, 0.05),
+        }[scenario]
+        
+        shuffled = files[:]
+        rng.shuffle(shuffled)
+        modify_count = max(1, int(len(files) * modify_ratio)) if files else 0
+        delete_count = int(len(files) * delete_ratio)
+        create_count = int(len(files) * create_ratio)
+        
+        to_modify = shuffled[:modify_count]
+        to_delete = shuffled[modify_count:modify_count + delete_count]
+        
+        for name in to_modify:
+            with open(self.test_folder / name, 'a') as f:
+                f.write(f"\n[MUTATED] {rng.random()}\n")
+        for name in to_delete:
+            os.remove(self.test_folder / name)
+        for index in range(create_count):
+            filepath = self.test_folder / "churn" / f"new_{index:07d}.txt"
+            filepath.parent.mkdir(parents=True, exist_ok=True)
+            filepath.write_text(''.join(rng.choices(string.ascii_letters + string.digits, k=50)))
+        
+        print(f"🧬 Scenario '{scenario}': {len(to_modify)} modified, {len(to_delete)} deleted, {create_count} created")
+        return {'corrupted': len(to_modify), 'deleted': len(to_delete), 'new': create_count}
+
+
+BENCH_LAYOUTS = ("wide", "deep", "flat")
+BENCH_SIZE_PROFILES = ("small", "mixed")
+BENCH_SCENARIOS = ("sparse", "mass", "churn")
+
+
+def _timed(timings, name, function, *args, **kwargs):
+    """Jalankan function, catat durasinya (detik) di timings[name], kembalikan hasilnya"""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    timings[name] = round(time.perf_counter() - start, 4)
+    print(f"⏱️  {name}: {timings[name]:.3f}s")
+    return result
+
+
+def _git_commit():
+    """Commit git saat ini (untuk membandingkan hasil benchmark antar commit)"""
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        return output.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def _time_dashboard(timings):
+    """Ukur endpoint dashboard lewat Flask test client (dilewati jika Flask tidak terpasang)"""
+    try:
+        import web_dashboard
+    except ImportError as e:
+        print(f"⏭️  Skipping dashboard endpoints: {e}")
+        return
+    
+    client = web_dashboard.app.test_client()
+    endpoints = ["/api/stats", "/api/logs"]
+    if os.path.exists(os.path.join(web_dashboard.app.root_path, web_dashboard.app.template_folder, "index.html")):
+        endpoints.insert(0, "/")
+    for endpoint in endpoints:
+        response = _timed(timings, f"dashboard GET {endpoint}", client.get, endpoint)
+        if response.status_code >= 400:
+            print(f"⚠️  {endpoint} returned HTTP {response.status_code}")
+
+
+def run_benchmark(workdir="./bench_workdir", files=1000, layout="wide", size_profile="small",
+                  large_files=0, large_size_mb=2048, scenario="sparse", seed=42, workers=1, output=None):
+    """Benchmark lengkap: buat tree, baseline, check, mutasi, analisis log, dashboard.
+    
+    Berjalan di workdir terpisah dengan nama file default (secure_files, hash_db.json,
+    security.log) agar dashboard bisa diukur apa adanya. Hasil ditulis sebagai JSON.
+    """
+    from file_integrity_monitor import FileIntegrityMonitor
+    from log_analyzer import LogAnalyzer
+    
+    workdir = Path(workdir).resolve()
+    if output is None:
+        output = Path.cwd() / "bench_results" / f"{_git_commit() or 'nocommit'}_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    output = Path(output).resolve()
+    
+    if workdir.exists():
+        shutil.rmtree(workdir)
+    workdir.mkdir(parents=True)
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+    
+    timings = {}
+    try:
+        tester = DemoTester()
+        tree = _timed(timings, "generate_tree", tester.generate_tree, files, layout, size_profile,
+                      large_files, large_size_mb, seed)
+        
+        def new_monitor(verify_mode="paranoid"):
+            # Konsol dimatikan agar print tidak ikut terukur
+            return FileIntegrityMonitor(verify_mode=verify_mode, workers=workers, console_levels=())
+        
+        _timed(timings, "initialize_baseline", new_monitor().initialize_baseline)
+        _timed(timings, "check_integrity (unchanged, paranoid)", new_monitor().check_integrity)
+        _timed(timings, "check_integrity (unchanged, fast)", new_monitor("fast").check_integrity)
+        
+        expected = tester.mutate_tree(scenario, seed)
+        results = _timed(timings, f"check_integrity ({scenario}, fast)", new_monitor("fast").check_integrity)
+        
+        analyzer = _timed(timings, "LogAnalyzer parse", LogAnalyzer, "security.log")
+        _timed(timings, "LogAnalyzer get_statistics", analyzer.get_statistics)
+        
+        _time_dashboard(timings)
+        
+        for key in ("corrupted", "deleted", "new"):
+            if results[key] != expected[key]:
+                print(f"⚠️  Expected {expected[key]} {key} files, check reported {results[key]}")
+        
+        report = {
+            'commit': _git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'params': {
+                'files': files, 'layout': layout, 'size_profile': size_profile,
+                'large_files': large_files, 'large_size_mb': large_size_mb,
+                'scenario': scenario, 'seed': seed, 'workers': workers
+            },
+            'tree': tree,
+            'log_bytes': os.path.getsize("security.log"),
+            'expected': expected,
+            'results': results,
+            'timings': timings
+        }
+    finally:
+        os.chdir(previous_cwd)
+    
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Benchmark results written to {output}")
+    return report
+
+def _parse_options(args):
+    """Ubah argumen '--key value' menjadi dict"""
+    options = {}
+    for key, value in zip(args[::2], args[1::2]):
+        options[key.lstrip("-")] = value
+    return options
 
 
 def main():
@@ -173,6 +407,7 @@ def main():
     print("  6. full-demo      - Run complete attack simulation")
     print("  7. clean          - Clean all test files")
     print("  8. exit           - Exit")
+    print("  9. benchmark      - Time monitor/analyzer/dashboard on a synthetic tree")
     
     if len(sys.argv) > 1:
         command = sys.argv[1]
@@ -247,6 +482,28 @@ def main():
         else:
             print("❌ Cancelled")
     
+    elif command == "benchmark" or command == "9":
+        options = _parse_options(sys.argv[2:])
+        try:
+            run_benchmark(
+                workdir=options.get("workdir", "./bench_workdir"),
+                files=int(options.get("files", 1000)),
+                layout=options.get("layout", "wide"),
+                size_profile=options.get("sizes", "small"),
+                large_files=int(options.get("large-files", 0)),
+                large_size_mb=int(options.get("large-size-mb", 2048)),
+                scenario=options.get("scenario", "sparse"),
+                seed=int(options.get("seed", 42)),
+                workers=int(options.get("workers", 1)),
+                output=options.get("output")
+            )
+        except ValueError as e:
+            print(f"❌ {e}")
+            print("\nUsage: python demo_test.py benchmark [--files N] [--layout wide|deep|flat]")
+            print("         [--sizes small|mixed] [--large-files N] [--large-size-mb MB]")
+            print("         [--scenario sparse|mass|churn] [--seed N] [--workers N]")
+            print("         [--workdir DIR] [--output FILE.json]")
+    
     else:
         print(f"❌ Unknown command: {command}")
         print("Run 'python demo_test.py' to see available commands")
@@ -0,0 +1,121 @@
+import os
+import sqlite3
+
+# Jenis event per file, ditentukan dari teks setelah 'File "<nama>" ' di pesan log.
+# Urutan penting: prefix yang lebih spesifik harus dicek lebih dulu.
+FILE_EVENTS = (
+    ('verified OK', 'verified'),
+    ('integrity failed', 'modified'),
+    ('detected', 'new'),
+    ('deleted', 'deleted'),
+    ('added to baseline', 'baseline'),
+    ('not migrated to', 'migration_skipped'),
+    ('migrated to', 'migrated'),
+)
+
+
+def classify_file_event(message, file_name):
+    """Jenis event untuk pesan 'File "<file_name>" ...' ('other' jika tidak dikenal)"""
+    rest = message[len(file_name) + 8:]
+    for prefix, event in FILE_EVENTS:
+        if rest.startswith(prefix):
+            return event
+    return 'other'
+
+
+class FileHistoryIndex:
+    """Index terbalik path file -> event di security.log, disimpan di SQLite (WAL).
+
+    Tiap baris log yang menyebut file disimpan sebagai (offset, path, level, event,
+    epoch); offset global baris menjadi primary key sehingga baris yang sama tidak pernah
+    tercatat dua kali walaupun log di-parse ulang. Meta menyimpan inode file log aktif,
+    total ukuran segmen, dan offset terakhir yang sudah diindex; jika log diganti di luar
+    writer atau dipotong, index dikosongkan.
+    """
+
+    def __init__(self, path, log_file):
+        self.path = path
+        self.log_file = os.path.abspath(log_file)
+        self.offset = 0
+        self._pending = []
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS events (offset INTEGER PRIMARY KEY, path TEXT NOT NULL, "
+                "level TEXT, event TEXT, epoch INTEGER)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS events_path ON events (path, epoch)")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)")
+        self._meta = dict(self._connection.execute("SELECT key, value FROM meta"))
+        if self._meta.get('log_file') == self.log_file:
+            self.offset = self._meta.get('offset', 0)
+
+    def sync(self, inode, base, size):
+        """Cocokkan index dengan log saat ini; kosongkan jika log diganti atau dipotong.
+
+        base adalah total ukuran segmen hasil rotasi (lihat log_segments) dan size ukuran
+        file aktif. Inode file aktif boleh berubah hanya jika base ikut bertambah, yaitu
+        saat writer merotasi log.
+        """
+        stored_base = self._meta.get('base', 0)
+        if (self._meta.get('log_file') != self.log_file or base < stored_base
+                or (base == stored_base and self._meta.get('inode') != inode)
+                or base + size < self.offset):
+            self.clear()
+        self._set_meta(log_file=self.log_file, inode=inode, base=base, offset=self.offset)
+
+    def add(self, offset, file_name, level, event, epoch):
+        """Antrekan satu event; ditulis saat commit"""
+        self._pending.append((offset, file_name, level, event, epoch))
+
+    def commit(self, offset):
+        """Tulis event yang tertunda dan catat offset log yang sudah diindex (satu transaksi)"""
+        with self._connection:
+            if self._pending:
+                self._connection.executemany(
+                    "INSERT OR IGNORE INTO events (offset, path, level, event, epoch) VALUES (?, ?, ?, ?, ?)",
+                    self._pending)
+            self._connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('offset', ?)", (offset,))
+        self._pending = []
+        self._meta['offset'] = self.offset = offset
+
+    def _set_meta(self, **values):
+        with self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                                         list(values.items()))
+        self._meta.update(values)
+        self.offset = self._meta.get('offset', 0)
+
+    def clear(self):
+        """Hapus seluruh event"""
+        self._pending = []
+        with self._connection:
+            self._connection.execute("DELETE FROM events")
+            self._connection.execute("DELETE FROM meta")
+        self._meta = {}
+        self.offset = 0
+
+    def query(self, file_name, start=None, end=None, limit=None):
+        """Event untuk satu file, urut offset: list (offset, level, event, epoch).
+
+        start/end adalah batas epoch (inklusif); None berarti tanpa batas.
+        """
+        sql = "SELECT offset, level, event, epoch FROM events WHERE path = ?"
+        params = [file_name]
+        if start is not None:
+            sql += " AND epoch >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND epoch <= ?"
+            params.append(end)
+        sql += " ORDER BY offset"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self._connection.execute(sql, params).fetchall()
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -1,19 +1,352 @@
 import os
 import json
+import stat
 import hashlib
+import mmap
+import zlib
+import threading
 import time
 from datetime import datetime
 from pathlib import Path
-import smtplib
-from email.mime.text import MIMEText
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from hash_storage import open_hash_store, JsonHashStore, STORAGE_BACKENDS
+from inotify_watcher import InotifyWatcher
+from log_writer import get_log_writer
+from log_segments import COMPRESSIONS
+from alert_pipeline import get_alert_pipeline
+
+# Mode verifikasi: "fast" percaya fingerprint stat, "paranoid" selalu hash ulang
+VERIFY_MODES = ("fast", "paranoid")
+
+# Field stat yang harus sama persis agar file boleh melewati hashing
+FINGERPRINT_FIELDS = ('size', 'mtime_ns', 'inode', 'ctime_ns')
+
+# Jenis worker pool: "thread" untuk storage I/O-bound, "process" untuk hashing CPU-bound
+EXECUTOR_TYPES = ("thread", "process")
+
+
+# Kebijakan symlink saat menelusuri folder: "follow" mengikuti semua symlink (perilaku
+# lama, dengan proteksi loop), "files" hanya symlink ke file, "skip" abaikan symlink
+SYMLINK_POLICIES = ("follow", "files", "skip")
+
+
+def walk_files(root, symlink_policy="follow"):
+    """Telusuri root dengan os.scandir, yield (relative_path, path, stat_result) per file.
+    
+    Setiap file hanya di-stat satu kali dan relative_path dibangun langsung dari nama
+    entry, tanpa Path.relative_to. Direktori yang tidak bisa dibaca dilewati.
+    """
+    if symlink_policy not in SYMLINK_POLICIES:
+        raise ValueError(f"Unknown symlink policy: {symlink_policy} (choose from {', '.join(SYMLINK_POLICIES)})")
+    
+    follow_dirs = symlink_policy == "follow"
+    root = os.fspath(root)
+    stack = [(root, "")]
+    
+    # (device, inode) direktori yang sudah dikunjungi, agar symlink melingkar tidak berulang
+    visited = set()
+    if follow_dirs:
+        root_stat = os.stat(root)
+        visited.add((root_stat.st_dev, root_stat.st_ino))
+    
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        
+        with entries:
+            for entry in entries:
+                try:
+                    is_symlink = entry.is_symlink()
+                    if is_symlink and symlink_policy == "skip":
+                        continue
+                    
+                    if entry.is_dir(follow_symlinks=follow_dirs):
+                        if follow_dirs:
+                            dir_stat = entry.stat()
+                            key = (dir_stat.st_dev, dir_stat.st_ino)
+                            if key in visited:
+                                continue
+                            visited.add(key)
+                        stack.append((entry.path, prefix + entry.name + os.sep))
+                    elif entry.is_file():
+                        yield prefix + entry.name, entry.path, entry.stat()
+                except OSError:
+                    # File bisa hilang di antara readdir dan stat
+                    continue
+
+
+# Level log yang dipakai monitor
+LOG_LEVELS = ("INFO", "WARNING", "ALERT")
+
+# Format baris security.log: teks lama atau JSON lines dengan field event eksplisit
+LOG_FORMATS = ("text", "json")
+
+
+# Strategi hashing; "auto" memilih berdasarkan ukuran file
+HASH_STRATEGIES = ("auto", "legacy", "buffered", "file_digest", "mmap")
+
+# Ukuran buffer baca yang dipakai ulang per thread
+HASH_BUFFER_SIZE = 1024 * 1024
+
+# File sebesar ini atau lebih di-hash lewat mmap. Sengaja tinggi: file yang
+# di-truncate saat sedang dipetakan bisa memicu SIGBUS, jadi mmap hanya dipakai
+# untuk file besar di mana selisih throughput-nya terasa (lihat hash_benchmark.py)
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+_buffers = threading.local()
+
+
+def _select_hash_strategy(size):
+    """Pilih strategi hashing berdasarkan ukuran file"""
+    if size >= MMAP_THRESHOLD:
+        return "mmap"
+    return "buffered"
+
+
+def _hash_legacy(f, hasher):
+    """Baca per blok 4096 byte (perilaku lama, untuk pembanding benchmark)"""
+    for byte_block in iter(lambda: f.read(4096), b""):
+        hasher.update(byte_block)
+
+
+def _hash_buffered(f, hasher):
+    """Baca dengan readinto ke bytearray yang dipakai ulang (tanpa alokasi per blok)"""
+    buffer = getattr(_buffers, "buffer", None)
+    if buffer is None:
+        buffer = _buffers.buffer = bytearray(HASH_BUFFER_SIZE)
+    view = memoryview(buffer)
+    while True:
+        size = f.readinto(buffer)
+        if not size:
+            break
+        hasher.update(view[:size])
+
+
+def _hash_mmap(f, hasher):
+    """Hash seluruh isi file lewat mmap dalam satu panggilan update"""
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if hasattr(mapped, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        hasher.update(mapped)
+
+
+# Algoritma hash kriptografis default (juga dipakai record lama tanpa field 'algorithm')
+DEFAULT_ALGORITHM = "sha256"
+
+# Hash non-kriptografis murah untuk pre-check sebelum hash kriptografis
+PRECHECK_ALGORITHMS = ("crc32", "adler32")
+
+
+class _ChecksumHasher:
+    """Bungkus zlib.crc32/adler32 dengan antarmuka update/hexdigest seperti hashlib"""
+    
+    def __init__(self, name):
+        self.name = name
+        self._function = getattr(zlib, name)
+        self._value = self._function(b"")
+    
+    def update(self, data):
+        self._value = self._function(data, self._value)
+    
+    def hexdigest(self):
+        return f"{self._value:08x}"
+
+
+class _MultiHasher:
+    """Update beberapa hasher sekaligus agar file cukup dibaca satu kali"""
+    
+    def __init__(self, algorithms):
+        self.hashers = {algorithm: new_hasher(algorithm) for algorithm in algorithms}
+    
+    def update(self, data):
+        for hasher in self.hashers.values():
+            hasher.update(data)
+    
+    def hexdigests(self):
+        return {algorithm: hasher.hexdigest() for algorithm, hasher in self.hashers.items()}
+
+
+def validate_algorithm(algorithm, precheck=False):
+    """Validasi nama algoritma hash; precheck=True untuk algoritma pre-check"""
+    if precheck:
+        if algorithm not in PRECHECK_ALGORITHMS:
+            raise ValueError(f"Unknown precheck algorithm: {algorithm} (choose from {', '.join(PRECHECK_ALGORITHMS)})")
+    elif algorithm not in hashlib.algorithms_available or algorithm.startswith("shake_"):
+        raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+
+
+def new_hasher(algorithm):
+    """Buat objek hasher untuk algoritma kriptografis (hashlib) atau pre-check (zlib)"""
+    if algorithm in PRECHECK_ALGORITHMS:
+        return _ChecksumHasher(algorithm)
+    return hashlib.new(algorithm)
+
+
+def hash_file_multi(file_path, algorithms, strategy="auto"):
+    """Hitung beberapa hash sekaligus dalam satu kali baca, kembalikan dict algoritma -> hex"""
+    if strategy not in HASH_STRATEGIES:
+        raise ValueError(f"Unknown hash strategy: {strategy}")
+    
+    hasher = _MultiHasher(algorithms)
+    with open(file_path, "rb", buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if strategy == "auto":
+            strategy = _select_hash_strategy(size)
+        
+        # mmap tidak bisa memetakan file kosong
+        if strategy == "mmap" and size == 0:
+            return hasher.hexdigests()
+        
+        # hashlib.file_digest hanya ada di Python 3.11+
+        if strategy == "file_digest" and hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, lambda: hasher).hexdigests()
+        elif strategy == "mmap":
+            _hash_mmap(f, hasher)
+        elif strategy in ("buffered", "file_digest"):
+            _hash_buffered(f, hasher)
+        else:
+            _hash_legacy(f, hasher)
+    return hasher.hexdigests()
+
+
+def hash_file(file_path, strategy="auto", algorithm=DEFAULT_ALGORITHM):
+    """Hitung hash dari file (level modul agar bisa dijalankan di process pool)"""
+    return hash_file_multi(file_path, (algorithm,), strategy)[algorithm]
+
+
+def _hash_worker(file_path, algorithms=(DEFAULT_ALGORITHM,), precheck=None):
+    """Jalankan hashing di worker, kembalikan (digests, error, detik) tanpa melempar exception.
+    
+    precheck berupa (algoritma, hash_tersimpan): jika hash murah tersebut masih sama,
+    hash kriptografis dilewati dan digests hanya berisi hasil pre-check.
+    """
+    started = time.perf_counter()
+    try:
+        if precheck:
+            precheck_algorithm, expected = precheck
+            digests = hash_file_multi(file_path, (precheck_algorithm,))
+            if digests[precheck_algorithm] == expected:
+                return digests, None, time.perf_counter() - started
+        return hash_file_multi(file_path, algorithms), None, time.perf_counter() - started
+    except Exception as e:
+        return None, str(e), time.perf_counter() - started
+
+
+class ScanProgress:
+    """Progress satu pengecekan, diperbarui thread pemindaian dan boleh dibaca thread lain.
+    
+    Total file dan byte diperkirakan dari baseline (hash database sebelum pengecekan);
+    ETA dihitung dari laju byte yang sudah diproses (file fast path ikut dihitung
+    walaupun tidak di-hash). Setelah finish(), elapsed berhenti bertambah.
+    """
+    
+    def __init__(self, files_total=0, bytes_total=0):
+        self.started = time.monotonic()
+        self.finished = None
+        self.files_total = files_total
+        self.bytes_total = bytes_total
+        self.files_scanned = 0
+        self.bytes_scanned = 0
+        self.bytes_hashed = 0
+    
+    def update(self, size, hashed):
+        """Catat satu file yang selesai diperiksa"""
+        self.files_scanned += 1
+        self.bytes_scanned += size
+        if hashed:
+            self.bytes_hashed += size
+    
+    def finish(self):
+        """Catat waktu selesai pengecekan"""
+        if self.finished is None:
+            self.finished = time.monotonic()
+    
+    def to_dict(self):
+        elapsed = (self.finished or time.monotonic()) - self.started
+        eta = None
+        if self.finished is not None:
+            eta = 0.0
+        elif self.bytes_total and self.bytes_scanned:
+            eta = max(0.0, elapsed * (self.bytes_total - self.bytes_scanned) / self.bytes_scanned)
+        elif self.files_total and self.files_scanned:
+            eta = max(0.0, elapsed * (self.files_total - self.files_scanned) / self.files_scanned)
+        
+        return {
+            'files_scanned': self.files_scanned,
+            'files_total': self.files_total,
+            'bytes_scanned': self.bytes_scanned,
+            'bytes_hashed': self.bytes_hashed,
+            'bytes_total': self.bytes_total,
+            'elapsed_seconds': round(elapsed, 3),
+            'eta_seconds': round(eta, 3) if eta is not None else None
+        }
+
 
 class FileIntegrityMonitor:
-    def __init__(self, watch_folder="./secure_files", hash_db="hash_db.json", log_file="security.log"):
+    def __init__(self, watch_folder="./secure_files", hash_db="hash_db.json", log_file="security.log",
+                 verify_mode="paranoid", workers=1, executor="thread",
+                 algorithm=None, precheck=None, storage=None, symlink_policy="follow",
+                 log_file_events=True, console_levels=LOG_LEVELS, console_sample=1,
+                 alert_transport="console", log_max_bytes=None, log_max_age=None, log_compression="gzip",
+                 log_format="text"):
+        if verify_mode not in VERIFY_MODES:
+            raise ValueError(f"Unknown verify mode: {verify_mode} (choose from {', '.join(VERIFY_MODES)})")
+        if executor not in EXECUTOR_TYPES:
+            raise ValueError(f"Unknown executor: {executor} (choose from {', '.join(EXECUTOR_TYPES)})")
+        if workers < 1:
+            raise ValueError(f"Workers must be at least 1, got {workers}")
+        if log_format not in LOG_FORMATS:
+            raise ValueError(f"Unknown log format: {log_format} (choose from {', '.join(LOG_FORMATS)})")
+        if symlink_policy not in SYMLINK_POLICIES:
+            raise ValueError(f"Unknown symlink policy: {symlink_policy} (choose from {', '.join(SYMLINK_POLICIES)})")
+        if algorithm:
+            validate_algorithm(algorithm)
+        if precheck:
+            validate_algorithm(precheck, precheck=True)
+        
         self.watch_folder = Path(watch_folder)
         self.hash_db_file = hash_db
         self.log_file = log_file
+        self.verify_mode = verify_mode
+        self.workers = workers
+        self.executor = executor
+        # Algoritma untuk record baru; record yang sudah ada tetap memakai algoritmanya sendiri
+        # sampai migrate_algorithm. None: ikuti algoritma hash database (default untuk DB kosong)
+        self.algorithm = algorithm or DEFAULT_ALGORITHM
+        self._algorithm_from_db = not algorithm
+        self.precheck = precheck
+        self.symlink_policy = symlink_policy
         self.hash_db = {}
         
+        # Log ditulis oleh background thread bersama; file tetap terbuka antar baris.
+        # Jika log_max_bytes/log_max_age (detik) diberikan, log dirotasi menjadi segmen terkompresi
+        self.log_writer = get_log_writer(log_file, max_bytes=log_max_bytes, max_age=log_max_age,
+                                         compression=log_compression)
+        # json: tiap baris berupa objek JSON {timestamp, level, event, file, message}; event per
+        # file yang di-hash ditambah algorithm, digest, dan hash_ms (lihat _hash_details)
+        self.log_format = log_format
+        # False: baris INFO per file ("verified OK", dll.) tidak dicatat, hanya ringkasan
+        self.log_file_events = log_file_events
+        # Level yang di-print ke konsol; INFO hanya di-print tiap console_sample baris
+        self.console_levels = set(console_levels)
+        self.console_sample = max(1, console_sample)
+        self._console_info_count = 0
+        
+        # Alert digabung per pengecekan dan dikirim oleh thread pipeline
+        # (console, smtp://host:port, atau URL webhook http(s)://...)
+        self.alerts = get_alert_pipeline(alert_transport)
+        
+        # storage None: backend ditebak dari ekstensi hash_db (.json atau .db/.sqlite/.sqlite3)
+        self.store = open_hash_store(hash_db, storage)
+        # Path yang berubah sejak load/save terakhir, agar backend SQLite cukup menulis baris itu
+        self._changed_paths = set()
+        self._store_synced = False
+        
         # Buat folder jika belum ada
         self.watch_folder.mkdir(exist_ok=True)
         
@@ -21,174 +354,506 @@ class FileIntegrityMonitor:
         self._load_hash_db()
     
     def _load_hash_db(self):
-        """Load hash database dari file JSON"""
+        """Load hash database dari storage (JSON atau SQLite)"""
         try:
-            if os.path.exists(self.hash_db_file):
-                with open(self.hash_db_file, 'r') as f:
-                    self.hash_db = json.load(f)
+            if self.store.exists():
+                self.hash_db = self.store.load()
+                self._store_synced = True
+                self._resolve_algorithm()
                 self._log("INFO", f"Hash database loaded: {len(self.hash_db)} files")
             else:
                 self._log("INFO", "No existing hash database found, creating new one")
         except Exception as e:
             self._log("WARNING", f"Error loading hash database: {str(e)}")
     
+    def _resolve_algorithm(self):
+        """Pakai algoritma terbanyak di hash database untuk record baru jika tidak ditentukan"""
+        if self._algorithm_from_db and self.hash_db:
+            algorithms = Counter(record.get('algorithm', DEFAULT_ALGORITHM) for record in self.hash_db.values())
+            self.algorithm = algorithms.most_common(1)[0][0]
+    
     def _save_hash_db(self):
-        """Simpan hash database ke file JSON"""
+        """Simpan hash database ke storage (hanya path yang berubah jika backend mendukung)"""
         try:
-            with open(self.hash_db_file, 'w') as f:
-                json.dump(self.hash_db, f, indent=2)
+            changed = self._changed_paths if self._store_synced else None
+            self.store.save(self.hash_db, changed)
+            self._changed_paths = set()
+            self._store_synced = True
             self._log("INFO", f"Hash database saved: {len(self.hash_db)} files")
         except Exception as e:
             self._log("WARNING", f"Error saving hash database: {str(e)}")
     
+    def reload_hash_db(self):
+        """Muat ulang hash database yang diubah proses lain, kembalikan jumlah record"""
+        self.hash_db = {}
+        self._changed_paths = set()
+        self._store_synced = False
+        self._load_hash_db()
+        return len(self.hash_db)
+    
+    def import_hash_db(self, source_file):
+        """Impor hash database JSON lama ke storage monitor (sekali jalan)"""
+        self.hash_db = JsonHashStore(source_file).load()
+        self._store_synced = False
+        self._resolve_algorithm()
+        self._save_hash_db()
+        self._log("INFO", f"Hash database imported from {source_file}: {len(self.hash_db)} files")
+        return len(self.hash_db)
+    
     def _calculate_hash(self, file_path):
-        """Hitung hash SHA256 dari file"""
-        sha256_hash = hashlib.sha256()
-        try:
-            with open(file_path, "rb") as f:
-                for byte_block in iter(lambda: f.read(4096), b""):
-                    sha256_hash.update(byte_block)
-            return sha256_hash.hexdigest()
-        except Exception as e:
-            self._log("WARNING", f"Error calculating hash for {file_path}: {str(e)}")
-            return None
+        """Hitung hash dari file dengan algoritma monitor"""
+        digests, _ = self._run_hash_job((file_path, (self.algorithm,)))
+        return digests[self.algorithm] if digests else None
     
-    def _log(self, level, message, file_name=None):
-        """Catat log ke file dengan format yang ditentukan"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    def _run_hash_job(self, job):
+        """Jalankan satu job _hash_worker di thread ini, catat error ke log, kembalikan (digests, detik)"""
+        digests, error, elapsed = _hash_worker(*job)
+        if error:
+            self._log("WARNING", f"Error calculating hash for {job[0]}: {error}", event="hash_error")
+        return digests, elapsed
+    
+    def _hash_in_order(self, jobs):
+        """Hash file dari iterable (item, job) dan yield (item, digests, detik) sesuai urutan input.
         
-        if file_name:
-            log_message = f'[{timestamp}] {level}: File "{file_name}" {message}'
-        else:
-            log_message = f'[{timestamp}] {level}: {message}'
+        job adalah tuple argumen _hash_worker (file_path, algorithms, precheck); job None
+        berarti file tidak perlu di-hash (digests dan detik None). Dengan workers > 1 hashing
+        dijalankan di pool, tapi hasil tetap diproses berurutan di thread utama
+        sehingga hasil dan log identik dengan jalur serial.
+        """
+        if self.workers <= 1:
+            for item, job in jobs:
+                yield (item, *self._run_hash_job(job)) if job is not None else (item, None, None)
+            return
         
-        # Tulis ke file log
-        try:
-            with open(self.log_file, 'a', encoding='utf-8') as f:
-                f.write(log_message + '\n')
-        except Exception as e:
-            print(f"Error writing to log file: {str(e)}")
+        executor_class = ThreadPoolExecutor if self.executor == "thread" else ProcessPoolExecutor
+        # Batasi jumlah pekerjaan yang antre agar memori tetap konstan untuk tree besar
+        max_pending = self.workers * 4
+        pending = deque()
+        
+        def drain_one():
+            item, job, future = pending.popleft()
+            if future is None:
+                return item, None, None
+            digests, error, elapsed = future.result()
+            if error:
+                self._log("WARNING", f"Error calculating hash for {job[0]}: {error}", event="hash_error")
+            return item, digests, elapsed
         
-        # Juga print ke konsol
-        print(log_message)
+        with executor_class(max_workers=self.workers) as pool:
+            for item, job in jobs:
+                future = pool.submit(_hash_worker, *job) if job is not None else None
+                pending.append((item, job, future))
+                if len(pending) >= max_pending:
+                    yield drain_one()
+            while pending:
+                yield drain_one()
     
-    def _send_alert(self, message):
-        """Simulasi pengiriman alert (print ke konsol)"""
-        print("\n" + "="*60)
-        print("⚠️  SECURITY ALERT ⚠️")
-        print(message)
-        print("="*60 + "\n")
+    def _hash_job(self, file_path, record=None, use_precheck=True, algorithm=None):
+        """Susun argumen _hash_worker untuk sebuah file.
         
-        # Untuk implementasi email sesungguhnya, uncomment kode berikut:
+        Record yang sudah ada di-hash dengan algoritmanya sendiri, file baru dengan algoritma
+        monitor. Saat migrasi (algorithm diberikan), algoritma lama record ikut dihitung
+        dalam pembacaan yang sama agar record lama bisa diverifikasi sebelum dipindahkan.
         """
-        try:
-            msg = MIMEText(message)
-            msg['Subject'] = 'Security Alert - File Integrity Monitor'
-            msg['From'] = 'monitor@example.com'
-            msg['To'] = 'admin@example.com'
-            
-            # Konfigurasi SMTP server
-            # s = smtplib.SMTP('localhost')
-            # s.send_message(msg)
-            # s.quit()
-        except Exception as e:
-            self._log("WARNING", f"Failed to send email alert: {str(e)}")
+        algorithms = [algorithm or self._record_algorithm(record)]
+        if self.precheck:
+            algorithms.append(self.precheck)
+        
+        precheck = None
+        if record is not None:
+            record_algorithm = record.get('algorithm', DEFAULT_ALGORITHM)
+            if record_algorithm not in algorithms:
+                algorithms.append(record_algorithm)
+            if (use_precheck and self.precheck and record.get('precheck_algorithm') == self.precheck
+                    and 'precheck_hash' in record):
+                precheck = (self.precheck, record['precheck_hash'])
+        
+        return (file_path, tuple(algorithms), precheck)
+    
+    def _record_algorithm(self, record):
+        """Algoritma record yang sudah ada, atau algoritma monitor untuk record baru"""
+        if record is None or 'hash' not in record:
+            return self.algorithm
+        return record.get('algorithm', DEFAULT_ALGORITHM)
+    
+    def _apply_digests(self, record, digests, algorithm=None):
+        """Simpan hash (dan pre-check) dari digests ke record.
+        
+        Tanpa algorithm, record tetap memakai algoritmanya sendiri; hanya migrate_algorithm
+        yang memindahkan record ke algoritma lain.
         """
+        algorithm = algorithm or self._record_algorithm(record)
+        record['hash'] = digests[algorithm]
+        record['algorithm'] = algorithm
+        if self.precheck:
+            record['precheck_algorithm'] = self.precheck
+            record['precheck_hash'] = digests[self.precheck]
+        else:
+            record.pop('precheck_algorithm', None)
+            record.pop('precheck_hash', None)
+        return record
+    
+    def _fingerprint(self, stat_result):
+        """Ambil fingerprint (size, mtime_ns, inode, ctime_ns) dari hasil stat"""
+        return {
+            'size': stat_result.st_size,
+            'mtime_ns': stat_result.st_mtime_ns,
+            'inode': stat_result.st_ino,
+            'ctime_ns': stat_result.st_ctime_ns
+        }
+    
+    def _fingerprint_matches(self, record, stat_result):
+        """Cek apakah fingerprint di database sama dengan stat file saat ini"""
+        current = self._fingerprint(stat_result)
+        return all(field in record and record[field] == current[field] for field in FINGERPRINT_FIELDS)
+    
+    def _log(self, level, message, file_name=None, event="system", details=None):
+        """Catat log ke file dengan format yang ditentukan.
+        
+        details (dict) berisi field tambahan seperti algoritma, digest, dan waktu hashing;
+        hanya ditulis pada format json agar format teks tetap sama.
+        """
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        if file_name:
+            message = f'File "{file_name}" {message}'
+        log_message = f'[{timestamp}] {level}: {message}'
+        
+        # Tulis ke file log (ALERT langsung di-flush ke disk)
+        if self.log_format == "json":
+            record = {'timestamp': timestamp, 'level': level, 'event': event, 'message': message}
+            if file_name:
+                record['file'] = file_name
+            if details:
+                record.update(details)
+            self.log_writer.write(json.dumps(record, ensure_ascii=False), flush=(level == "ALERT"))
+        else:
+            self.log_writer.write(log_message, flush=(level == "ALERT"))
+        
+        # Juga print ke konsol sesuai level dan sampling
+        if level in self.console_levels:
+            if level == "INFO":
+                self._console_info_count += 1
+                if (self._console_info_count - 1) % self.console_sample:
+                    return
+            print(log_message)
+    
+    def _log_file_event(self, message, file_name, event, details=None):
+        """Catat baris INFO per file, bisa dimatikan lewat log_file_events=False"""
+        if self.log_file_events:
+            self._log("INFO", message, file_name, event, details)
+    
+    def _hash_details(self, algorithm, digests, elapsed, **extra):
+        """Field log json untuk file yang di-hash: algoritma, digest, dan lama hashing (ms)"""
+        if self.log_format != "json":
+            return None
+        return {'algorithm': algorithm, 'digest': digests[algorithm],
+                'hash_ms': round(elapsed * 1000, 3), **extra}
+    
+    def _send_alert(self, title, file_name):
+        """Antrekan alert ke pipeline; dikirim sebagai digest di luar thread pemindaian"""
+        self.alerts.submit(title, file_name)
     
     def initialize_baseline(self):
         """Buat baseline hash untuk semua file yang ada"""
         self._log("INFO", "Initializing baseline hash database...")
         
+        def jobs():
+            for relative_path, file_path, stat_result in walk_files(self.watch_folder, self.symlink_policy):
+                yield (relative_path, stat_result), self._hash_job(file_path)
+        
         file_count = 0
-        for file_path in self.watch_folder.rglob('*'):
-            if file_path.is_file():
-                file_hash = self._calculate_hash(file_path)
-                if file_hash:
-                    relative_path = str(file_path.relative_to(self.watch_folder))
-                    self.hash_db[relative_path] = {
-                        'hash': file_hash,
-                        'size': file_path.stat().st_size,
-                        'modified': file_path.stat().st_mtime,
-                        'created': datetime.now().isoformat()
-                    }
-                    file_count += 1
-                    self._log("INFO", "added to baseline", relative_path)
+        for (relative_path, stat_result), digests, elapsed in self._hash_in_order(jobs()):
+            if digests:
+                record = self.hash_db[relative_path] = self._apply_digests({
+                    'modified': stat_result.st_mtime,
+                    'created': datetime.now().isoformat(),
+                    **self._fingerprint(stat_result)
+                }, digests)
+                self._changed_paths.add(relative_path)
+                file_count += 1
+                self._log_file_event("added to baseline", relative_path, "baseline",
+                                     self._hash_details(record['algorithm'], digests, elapsed))
         
         self._save_hash_db()
         self._log("INFO", f"Baseline initialized with {file_count} files")
+        self.log_writer.flush()
         return file_count
     
-    def check_integrity(self):
-        """Periksa integritas file dan deteksi perubahan"""
-        self._log("INFO", "Starting integrity check...")
-        
-        current_files = set()
+    def _verify_files(self, candidates, progress=None):
+        """Verifikasi file dari iterable (relative_path, file_path, stat_result), kembalikan hitungan"""
         safe_files = 0
         corrupted_files = 0
         new_files = 0
+        fast_path_files = 0
+        hashed_files = 0
         
-        # Cek semua file yang ada saat ini
-        for file_path in self.watch_folder.rglob('*'):
-            if file_path.is_file():
-                relative_path = str(file_path.relative_to(self.watch_folder))
-                current_files.add(relative_path)
+        # File dengan fingerprint sama (mode fast) tidak di-hash
+        def jobs():
+            for relative_path, file_path, stat_result in candidates:
+                record = self.hash_db.get(relative_path)
+                fast_path = (self.verify_mode == "fast" and record is not None
+                             and self._fingerprint_matches(record, stat_result))
+                job = None if fast_path else self._hash_job(file_path, record)
+                yield (relative_path, stat_result, record, fast_path), job
+        
+        for (relative_path, stat_result, record, fast_path), digests, elapsed in self._hash_in_order(jobs()):
+            if progress is not None:
+                progress.update(stat_result.st_size, bool(digests))
+            
+            # Fast path: fingerprint tidak berubah, tidak perlu hash ulang
+            if fast_path:
+                details = None
+                if self.log_format == "json":
+                    details = {'algorithm': record.get('algorithm', DEFAULT_ALGORITHM),
+                               'digest': record['hash'], 'fast_path': True}
+                self._log_file_event("verified OK", relative_path, "verified", details)
+                safe_files += 1
+                fast_path_files += 1
+                continue
+            
+            if not digests:
+                continue
+            hashed_files += 1
+            
+            # File baru (tidak ada di baseline)
+            if record is None:
+                self._log("ALERT", "detected (Unknown file)", relative_path, "new",
+                          self._hash_details(self.algorithm, digests, elapsed))
+                self._send_alert('Unknown file detected', relative_path)
+                new_files += 1
                 
-                current_hash = self._calculate_hash(file_path)
-                if not current_hash:
-                    continue
+                # Tambahkan ke database
+                self.hash_db[relative_path] = self._apply_digests({
+                    'modified': stat_result.st_mtime,
+                    'created': datetime.now().isoformat(),
+                    **self._fingerprint(stat_result)
+                }, digests)
+                self._changed_paths.add(relative_path)
+            
+            # File sudah ada, cek integritasnya dengan algoritma yang tercatat di record
+            else:
+                original = dict(record)
+                record_algorithm = record.get('algorithm', DEFAULT_ALGORITHM)
+                # Tanpa hash kriptografis berarti pre-check murah sudah cocok
+                prechecked = record_algorithm not in digests
                 
-                # File baru (tidak ada di baseline)
-                if relative_path not in self.hash_db:
-                    self._log("ALERT", "detected (Unknown file)", relative_path)
-                    self._send_alert(f'Unknown file detected: {relative_path}')
-                    new_files += 1
+                if prechecked or digests[record_algorithm] == record['hash']:
+                    # Pre-check yang cocok dicatat dengan algoritma pre-check
+                    self._log_file_event("verified OK", relative_path, "verified",
+                                         self._hash_details(self.precheck if prechecked else record_algorithm,
+                                                            digests, elapsed))
+                    safe_files += 1
                     
-                    # Tambahkan ke database
-                    self.hash_db[relative_path] = {
-                        'hash': current_hash,
-                        'size': file_path.stat().st_size,
-                        'modified': file_path.stat().st_mtime,
-                        'created': datetime.now().isoformat()
-                    }
-                
-                # File sudah ada, cek integritasnya
+                    # Perbarui pre-check (jika diaktifkan) tanpa mengganti algoritma record
+                    if not prechecked:
+                        self._apply_digests(record, digests)
                 else:
-                    stored_hash = self.hash_db[relative_path]['hash']
+                    self._log("WARNING", "integrity failed!", relative_path, "modified",
+                              self._hash_details(record_algorithm, digests, elapsed, expected_digest=record['hash']))
+                    self._send_alert('File integrity failed', relative_path)
+                    corrupted_files += 1
                     
-                    if current_hash == stored_hash:
-                        self._log("INFO", "verified OK", relative_path)
-                        safe_files += 1
-                    else:
-                        self._log("WARNING", "integrity failed!", relative_path)
-                        self._send_alert(f'File integrity failed: {relative_path}')
-                        corrupted_files += 1
-                        
-                        # Update hash di database
-                        self.hash_db[relative_path]['hash'] = current_hash
-                        self.hash_db[relative_path]['modified'] = file_path.stat().st_mtime
-        
-        # Cek file yang dihapus
-        deleted_files = 0
-        baseline_files = set(self.hash_db.keys())
-        missing_files = baseline_files - current_files
+                    # Update hash di database
+                    self._apply_digests(record, digests)
+                    record['modified'] = stat_result.st_mtime
+                
+                # Perbarui fingerprint agar pengecekan berikutnya bisa lewat fast path
+                record.update(self._fingerprint(stat_result))
+                if record != original:
+                    self._changed_paths.add(relative_path)
         
+        return {
+            'safe': safe_files,
+            'corrupted': corrupted_files,
+            'new': new_files,
+            'fast_path': fast_path_files,
+            'hashed': hashed_files
+        }
+    
+    def _report_deleted(self, missing_files):
+        """Laporkan file yang hilang dan hapus dari database, kembalikan jumlahnya"""
+        deleted_files = 0
         for missing_file in missing_files:
-            self._log("ALERT", "deleted (File missing)", missing_file)
-            self._send_alert(f'File deleted: {missing_file}')
+            self._log("ALERT", "deleted (File missing)", missing_file, "deleted")
+            self._send_alert('File deleted', missing_file)
             deleted_files += 1
             del self.hash_db[missing_file]
-        
-        # Simpan perubahan
+            self._changed_paths.add(missing_file)
+        return deleted_files
+    
+    def _finish_check(self, title, counts):
+        """Simpan database, catat ringkasan, dan susun dict hasil pengecekan"""
+        self.alerts.end_batch()
         self._save_hash_db()
         
-        # Summary
-        self._log("INFO", f"Integrity check completed - Safe: {safe_files}, Corrupted: {corrupted_files}, New: {new_files}, Deleted: {deleted_files}")
+        self._log("INFO", f"{title} - Safe: {counts['safe']}, Corrupted: {counts['corrupted']}, New: {counts['new']}, Deleted: {counts['deleted']}", event="summary")
+        self._log("INFO", f"Verification mode: {self.verify_mode} - Fast path: {counts['fast_path']}, Hashed: {counts['hashed']}", event="summary")
+        # Pastikan ringkasan sudah di disk sebelum hasil dikembalikan ke pemanggil
+        self.log_writer.flush()
         
         return {
-            'safe': safe_files,
-            'corrupted': corrupted_files,
-            'new': new_files,
-            'deleted': deleted_files
+            'safe': counts['safe'],
+            'corrupted': counts['corrupted'],
+            'new': counts['new'],
+            'deleted': counts['deleted'],
+            'fast_path': counts['fast_path'],
+            'hashed': counts['hashed']
+        }
+    
+    def check_integrity(self, progress=None):
+        """Periksa integritas file dan deteksi perubahan.
+        
+        progress (ScanProgress) opsional diperbarui per file; totalnya diisi dari baseline
+        dan waktu selesainya dicatat saat pengecekan berakhir.
+        """
+        self._log("INFO", "Starting integrity check...")
+        if progress is not None:
+            progress.files_total = len(self.hash_db)
+            progress.bytes_total = sum(record.get('size', 0) for record in self.hash_db.values())
+        
+        current_files = set()
+        
+        # Cek semua file yang ada saat ini
+        def candidates():
+            for relative_path, file_path, stat_result in walk_files(self.watch_folder, self.symlink_policy):
+                current_files.add(relative_path)
+                yield relative_path, file_path, stat_result
+        
+        try:
+            counts = self._verify_files(candidates(), progress)
+            
+            # Cek file yang dihapus
+            missing_files = set(self.hash_db.keys()) - current_files
+            counts['deleted'] = self._report_deleted(missing_files)
+            
+            return self._finish_check("Integrity check completed", counts)
+        finally:
+            if progress is not None:
+                progress.finish()
+    
+    def _scan_stat(self, relative_path):
+        """stat path di watch_folder dengan symlink_policy yang sama seperti walk_files.
+        
+        Kembalikan None jika path tidak akan dipindai walk_files (symlink yang dilewati,
+        atau berada di bawah direktori symlink yang tidak diikuti). OSError jika tidak ada.
+        """
+        path = self.watch_folder / relative_path
+        if self.symlink_policy == "follow":
+            return path.stat()
+        
+        # Komponen di atas path adalah direktori; symlink hanya boleh di komponen terakhir
+        current = self.watch_folder
+        for part in Path(relative_path).parent.parts:
+            current = current / part
+            if stat.S_ISLNK(current.lstat().st_mode):
+                return None
+        
+        stat_result = path.lstat()
+        if not stat.S_ISLNK(stat_result.st_mode):
+            return stat_result
+        if self.symlink_policy == "skip":
+            return None
+        # "files": symlink ke file diikuti, symlink ke direktori tidak
+        stat_result = path.stat()
+        return stat_result if stat.S_ISREG(stat_result.st_mode) else None
+    
+    def check_paths(self, relative_paths):
+        """Periksa ulang hanya path tertentu (relatif terhadap watch_folder), dipakai mode watch"""
+        self._log("INFO", f"Starting incremental check of {len(relative_paths)} paths...")
+        
+        targets = set()
+        for relative_path in relative_paths:
+            full_path = self.watch_folder / relative_path
+            try:
+                stat_result = self._scan_stat(relative_path)
+            except OSError:
+                stat_result = None
+            if stat_result is not None and stat.S_ISDIR(stat_result.st_mode):
+                for nested_path, _, _ in walk_files(full_path, self.symlink_policy):
+                    targets.add(os.path.join(relative_path, nested_path))
+            if relative_path in self.hash_db or (stat_result is not None and stat.S_ISREG(stat_result.st_mode)):
+                targets.add(relative_path)
+            else:
+                # Direktori yang dihapus/dipindah: record di bawahnya ikut diperiksa
+                prefix = relative_path + os.sep
+                targets.update(path for path in self.hash_db if path.startswith(prefix))
+        
+        missing_files = set()
+        
+        def candidates():
+            for relative_path in sorted(targets):
+                file_path = self.watch_folder / relative_path
+                try:
+                    stat_result = self._scan_stat(relative_path)
+                except OSError:
+                    stat_result = None
+                
+                if stat_result is not None and stat.S_ISREG(stat_result.st_mode):
+                    yield relative_path, file_path, stat_result
+                elif relative_path in self.hash_db:
+                    missing_files.add(relative_path)
+        
+        counts = self._verify_files(candidates())
+        counts['deleted'] = self._report_deleted(missing_files)
+        
+        return self._finish_check("Incremental check completed", counts)
+    
+    def migrate_algorithm(self, algorithm, precheck=None):
+        """Migrasikan hash database ke algoritma baru dalam satu kali pemindaian.
+        
+        Setiap file dibaca sekali untuk menghitung hash lama dan hash baru. Record hanya
+        dipindahkan jika hash lamanya masih cocok; file yang sudah berubah dibiarkan
+        dengan hash lama agar tetap dilaporkan oleh check_integrity berikutnya.
+        """
+        validate_algorithm(algorithm)
+        if precheck:
+            validate_algorithm(precheck, precheck=True)
+        self.algorithm = algorithm
+        self._algorithm_from_db = False
+        self.precheck = precheck
+        
+        self._log("INFO", f"Migrating hash database to {algorithm}...")
+        
+        current = 0
+        
+        def jobs():
+            nonlocal current
+            for relative_path, record in list(self.hash_db.items()):
+                if (record.get('algorithm', DEFAULT_ALGORITHM) == algorithm
+                        and record.get('precheck_algorithm') == precheck):
+                    current += 1
+                    continue
+                file_path = self.watch_folder / relative_path
+                job = self._hash_job(file_path, record, use_precheck=False, algorithm=algorithm)
+                yield (relative_path, record), job
+        
+        migrated = 0
+        skipped = 0
+        for (relative_path, record), digests, _ in self._hash_in_order(jobs()):
+            if not digests:
+                skipped += 1
+                continue
+            
+            old_algorithm = record.get('algorithm', DEFAULT_ALGORITHM)
+            if digests[old_algorithm] == record['hash']:
+                self._apply_digests(record, digests, algorithm)
+                self._changed_paths.add(relative_path)
+                migrated += 1
+                self._log_file_event(f"migrated to {algorithm}", relative_path, "migrated")
+            else:
+                self._log("WARNING", f"not migrated to {algorithm} (content differs from baseline)", relative_path,
+                          "migration_skipped")
+                skipped += 1
+        
+        self._save_hash_db()
+        self._log("INFO", f"Migration completed - Migrated: {migrated}, Already current: {current}, Skipped: {skipped}", event="summary")
+        self.log_writer.flush()
+        
+        return {
+            'migrated': migrated,
+            'current': current,
+            'skipped': skipped
         }
     
     def continuous_monitor(self, interval=60):
@@ -208,52 +873,332 @@ class FileIntegrityMonitor:
         except KeyboardInterrupt:
             self._log("INFO", "Monitoring stopped by user")
             print("\n\n✅ Monitoring stopped gracefully")
+    
+    def watch_monitor(self, debounce=1.0, reconcile_interval=3600, fallback_interval=60):
+        """Monitor berbasis event inotify: hanya path yang tersentuh yang diperiksa ulang.
+        
+        Event ditampung sampai tidak ada event baru selama debounce detik (atau paling
+        lama 10x debounce saat tulis terus-menerus). Pemindaian penuh tetap dijalankan
+        tiap reconcile_interval detik dan saat antrean inotify overflow, untuk menangkap
+        event yang terlewat. Tanpa inotify, kembali ke continuous_monitor biasa.
+        """
+        try:
+            watcher = InotifyWatcher(self.watch_folder)
+        except OSError as e:
+            self._log("WARNING", f"inotify unavailable ({str(e)}), falling back to polling every {fallback_interval}s")
+            self.continuous_monitor(fallback_interval)
+            return
+        
+        self._log("INFO", f"Starting event-driven monitoring (debounce: {debounce}s, reconcile: {reconcile_interval}s)")
+        print(f"\n🔒 File Integrity Monitor Started (watch mode)")
+        print(f"📁 Watching folder: {self.watch_folder.absolute()}")
+        print(f"⚡ Debounce: {debounce} seconds")
+        print(f"🔁 Full reconciliation every {reconcile_interval} seconds")
+        print(f"📋 Log file: {self.log_file}")
+        print("\nPress Ctrl+C to stop...\n")
+        
+        watch_root = Path(watcher.root)
+        pending = set()
+        first_event = last_event = None
+        
+        try:
+            self.check_integrity()
+            next_reconcile = time.monotonic() + reconcile_interval
+            
+            while True:
+                now = time.monotonic()
+                timeout = debounce if pending else max(0.0, next_reconcile - now)
+                events = watcher.read_events(timeout)
+                now = time.monotonic()
+                
+                for path in events:
+                    relative_path = str(Path(path).relative_to(watch_root))
+                    if relative_path != ".":
+                        pending.add(relative_path)
+                if events:
+                    last_event = now
+                    first_event = first_event or now
+                
+                if watcher.overflowed or now >= next_reconcile:
+                    if watcher.overflowed:
+                        self._log("WARNING", "inotify event queue overflowed, running full reconciliation")
+                        watcher.overflowed = False
+                    self.check_integrity()
+                    pending.clear()
+                    first_event = last_event = None
+                    next_reconcile = time.monotonic() + reconcile_interval
+                
+                elif pending and (now - last_event >= debounce or now - first_event >= debounce * 10):
+                    self.check_paths(pending)
+                    pending = set()
+                    first_event = last_event = None
+        except KeyboardInterrupt:
+            self._log("INFO", "Monitoring stopped by user")
+            print("\n\n✅ Monitoring stopped gracefully")
+        finally:
+            watcher.close()
+
+
+def _pop_flag(args, name):
+    """Cek apakah flag '--name' ada di daftar argumen (dan hapus dari daftar)"""
+    if name in args:
+        args.remove(name)
+        return True
+    return False
+
+
+def _pop_option(args, name, default=None):
+    """Ambil nilai opsi '--name value' dari daftar argumen (dan hapus dari daftar)"""
+    if name in args:
+        index = args.index(name)
+        if index + 1 < len(args):
+            value = args[index + 1]
+            del args[index:index + 2]
+            return value
+        del args[index]
+    return default
+
+
+def print_usage():
+    """Tampilkan cara penggunaan CLI"""
+    print("\nUsage:")
+    print("  python file_integrity_monitor.py init              - Initialize baseline")
+    print("  python file_integrity_monitor.py check             - Run single check")
+    print("  python file_integrity_monitor.py monitor [seconds] - Continuous monitoring")
+    print("  python file_integrity_monitor.py migrate <algo>    - Re-hash baseline with a new algorithm")
+    print("  python file_integrity_monitor.py import-json <file> - Import a JSON hash database into --db")
+    print("  python file_integrity_monitor.py serve             - Run the resident monitor service")
+    print("  python file_integrity_monitor.py status            - Show monitor service status")
+    print("\nOptions:")
+    print("  --verify fast|paranoid   - fast: skip hashing when size/mtime/inode/ctime unchanged")
+    print("                             paranoid: re-hash every file (default)")
+    print("  --workers N              - Hash files with N parallel workers (default: 1)")
+    print("  --executor thread|process - Worker pool type for --workers (default: thread)")
+    print("  --algorithm NAME         - Hash algorithm for new files, e.g. sha256, blake2b")
+    print(f"                             (default: the database's algorithm, {DEFAULT_ALGORITHM} for a new one)")
+    print(f"  --precheck {'|'.join(PRECHECK_ALGORITHMS)}   - Cheap checksum tried before the crypto hash")
+    print("  --db PATH                - Hash database file (default: hash_db.json; .db/.sqlite/.sqlite3 use SQLite)")
+    print(f"  --storage {'|'.join(STORAGE_BACKENDS)}      - Force the storage backend instead of guessing from --db")
+    print(f"  --symlinks {'|'.join(SYMLINK_POLICIES)} - Symlink handling while scanning (default: follow)")
+    print("  --quiet                  - Only print WARNING/ALERT log lines to the console")
+    print("  --console-sample N       - Print only every Nth INFO log line to the console")
+    print("  --no-file-events         - Skip per-file INFO lines (e.g. 'verified OK'), keep summaries")
+    print("  --alert TARGET           - Alert transport: console (default), smtp://host:port, http(s)://webhook")
+    print("  --watch                  - monitor: react to inotify events instead of polling (Linux)")
+    print("  --debounce SECONDS       - --watch: wait for writes to settle before checking (default: 1)")
+    print("  --reconcile SECONDS      - --watch: full rescan interval to catch missed events (default: 3600)")
+    print("  --log-max-mb N           - Rotate security.log into a compressed segment after N MB")
+    print("  --log-max-age HOURS      - Rotate security.log after it covers HOURS hours")
+    print(f"  --log-compression {'|'.join(COMPRESSIONS)} - Compression for rotated segments (default: gzip)")
+    print(f"  --log-format {'|'.join(LOG_FORMATS)}    - security.log line format; json adds event types,")
+    print("                             digests and hash timings")
+    print("  --socket PATH            - Monitor service control socket (default: monitor.sock)")
+    print("  --no-service             - init/check: run in this process even if the service is running")
+
+
+def _print_check_results(results):
+    print("\n📊 Results:")
+    print(f"   ✅ Safe files: {results['safe']}")
+    print(f"   ⚠️  Corrupted files: {results['corrupted']}")
+    print(f"   🆕 New files: {results['new']}")
+    print(f"   🗑️  Deleted files: {results['deleted']}")
+    print(f"   ⚡ Fast path (stat unchanged): {results['fast_path']}")
+    print(f"   🔑 Re-hashed: {results['hashed']}")
+
+
+# Opsi CLI yang harus sama dengan opsi service: opsi -> nama setting di status service
+SERVICE_OPTIONS = {"--verify": "verify_mode", "--workers": "workers", "--algorithm": "algorithm",
+                   "--db": "hash_db", "--storage": "storage", "--symlinks": "symlink_policy",
+                   "--precheck": "precheck", "--executor": "executor", "--log-format": "log_format"}
+
+# Opsi yang tidak bisa diterapkan service; jika diberikan, perintah dijalankan di proses ini
+LOCAL_OPTIONS = ("--alert", "--no-file-events", "--log-max-mb", "--log-max-age", "--log-compression")
+
+
+def _run_via_service(client, command, options):
+    """Jalankan init/check lewat monitor service yang sudah hangat.
+    
+    Kembalikan False jika perintah harus dijalankan di proses ini: service tidak berjalan,
+    atau options (opsi CLI yang diberikan eksplisit, --db sebagai path absolut) berisi
+    opsi LOCAL_OPTIONS atau nilai SERVICE_OPTIONS yang berbeda dengan opsi service.
+    """
+    if command == "init":
+        options = {option: value for option, value in options.items() if option != "--verify"}
+    try:
+        settings = client.status()['settings']
+    except OSError:
+        return False
+    except RuntimeError as e:
+        print(f"❌ Monitor service error: {e}")
+        return True
+    
+    mismatched = []
+    for option, value in options.items():
+        if option not in SERVICE_OPTIONS:
+            mismatched.append(f"{option} (not supported by the service)")
+        elif str(value) != str(settings.get(SERVICE_OPTIONS[option])):
+            mismatched.append(f"{option} {value} (service: {settings.get(SERVICE_OPTIONS[option])})")
+    if mismatched:
+        print(f"ℹ️  Monitor service runs with different options: {', '.join(mismatched)}")
+        print("   Running in this process instead")
+        return False
+    
+    try:
+        if command == "init":
+            print("\n🔧 Initializing baseline (monitor service)...")
+            count = client.initialize_baseline()
+            print(f"\n✅ Baseline created for {count} files")
+        else:
+            print("\n🔍 Running single integrity check (monitor service)...")
+            _print_check_results(client.check())
+    except OSError:
+        return False
+    except RuntimeError as e:
+        print(f"❌ Monitor service error: {e}")
+    return True
+
+
+def _notify_service(client):
+    """Minta service yang sedang berjalan memuat ulang hash database yang baru diubah"""
+    try:
+        client.reload()
+        print("🔄 Monitor service reloaded the hash database")
+    except (OSError, RuntimeError):
+        pass
 
 
 def main():
     """Fungsi utama untuk menjalankan monitor"""
     import sys
+    # Import di sini karena monitor_service memakai ScanProgress dari modul ini
+    from monitor_service import MonitorService, MonitorClient, DEFAULT_SOCKET
+    
+    args = sys.argv[1:]
+    # Opsi monitor yang diberikan eksplisit dicocokkan dengan service yang sedang berjalan
+    service_options = {option: args[args.index(option) + 1] for option in SERVICE_OPTIONS
+                       if option in args[:-1]}
+    service_options.update((option, None) for option in LOCAL_OPTIONS if option in args)
+    if "--db" in service_options:
+        service_options["--db"] = os.path.abspath(service_options["--db"])
+    verify_mode = _pop_option(args, "--verify", "paranoid")
+    executor = _pop_option(args, "--executor", "thread")
+    algorithm = _pop_option(args, "--algorithm")
+    precheck = _pop_option(args, "--precheck")
+    hash_db = _pop_option(args, "--db", "hash_db.json")
+    storage = _pop_option(args, "--storage")
+    watch = _pop_flag(args, "--watch")
+    symlink_policy = _pop_option(args, "--symlinks", "follow")
+    quiet = _pop_flag(args, "--quiet")
+    log_file_events = not _pop_flag(args, "--no-file-events")
+    alert_transport = _pop_option(args, "--alert", "console")
+    log_compression = _pop_option(args, "--log-compression", "gzip")
+    log_format = _pop_option(args, "--log-format", "text")
+    socket_path = _pop_option(args, "--socket", DEFAULT_SOCKET)
+    use_service = not _pop_flag(args, "--no-service")
+    
+    # init/check memakai service yang sedang berjalan (hash database sudah di memori)
+    client = MonitorClient(socket_path)
+    if args and args[0] in ("init", "check") and use_service and \
+            _run_via_service(client, args[0], service_options):
+        return
+    if args and args[0] == "status":
+        try:
+            print(json.dumps(client.status(), indent=2))
+        except (OSError, RuntimeError) as e:
+            print(f"❌ Monitor service not available on {socket_path}: {e}")
+        return
     
-    monitor = FileIntegrityMonitor()
+    try:
+        workers = int(_pop_option(args, "--workers", 1))
+        debounce = float(_pop_option(args, "--debounce", 1.0))
+        reconcile_interval = int(_pop_option(args, "--reconcile", 3600))
+        console_sample = int(_pop_option(args, "--console-sample", 1))
+        log_max_mb = float(_pop_option(args, "--log-max-mb", 0))
+        log_max_hours = float(_pop_option(args, "--log-max-age", 0))
+        monitor = FileIntegrityMonitor(hash_db=hash_db, verify_mode=verify_mode, workers=workers,
+                                       executor=executor, algorithm=algorithm, precheck=precheck,
+                                       storage=storage, symlink_policy=symlink_policy,
+                                       log_file_events=log_file_events,
+                                       console_levels=("WARNING", "ALERT") if quiet else LOG_LEVELS,
+                                       console_sample=console_sample, alert_transport=alert_transport,
+                                       log_max_bytes=int(log_max_mb * 1024 * 1024) or None,
+                                       log_max_age=log_max_hours * 3600 or None,
+                                       log_compression=log_compression, log_format=log_format)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
     
-    if len(sys.argv) > 1:
-        command = sys.argv[1]
+    if len(args) > 0:
+        command = args[0]
         
         if command == "init":
             print("\n🔧 Initializing baseline...")
             count = monitor.initialize_baseline()
             print(f"\n✅ Baseline created for {count} files")
+            _notify_service(client)
             
         elif command == "check":
             print("\n🔍 Running single integrity check...")
-            results = monitor.check_integrity()
-            print("\n📊 Results:")
-            print(f"   ✅ Safe files: {results['safe']}")
-            print(f"   ⚠️  Corrupted files: {results['corrupted']}")
-            print(f"   🆕 New files: {results['new']}")
-            print(f"   🗑️  Deleted files: {results['deleted']}")
+            _print_check_results(monitor.check_integrity())
+            _notify_service(client)
             
         elif command == "monitor":
-            interval = int(sys.argv[2]) if len(sys.argv) > 2 else 60
-            monitor.continuous_monitor(interval)
+            interval = int(args[1]) if len(args) > 1 else 60
+            if watch:
+                monitor.watch_monitor(debounce, reconcile_interval, fallback_interval=interval)
+            else:
+                monitor.continuous_monitor(interval)
+            
+        elif command == "migrate":
+            target = args[1] if len(args) > 1 else algorithm or DEFAULT_ALGORITHM
+            print(f"\n🔁 Migrating baseline to {target}...")
+            try:
+                results = monitor.migrate_algorithm(target, precheck)
+            except ValueError as e:
+                print(f"❌ {e}")
+                return
+            print("\n📊 Results:")
+            print(f"   🔁 Migrated: {results['migrated']}")
+            print(f"   ✅ Already current: {results['current']}")
+            print(f"   ⏭️  Skipped: {results['skipped']}")
+            _notify_service(client)
+            
+        elif command == "import-json":
+            source = args[1] if len(args) > 1 else "hash_db.json"
+            if os.path.abspath(source) == os.path.abspath(hash_db):
+                print("❌ Source and --db are the same file")
+                return
+            print(f"\n📥 Importing {source} into {hash_db}...")
+            try:
+                count = monitor.import_hash_db(source)
+            except (OSError, ValueError) as e:
+                print(f"❌ Import failed: {e}")
+                return
+            print(f"\n✅ Imported {count} records")
+            _notify_service(client)
+            
+        elif command == "serve":
+            try:
+                MonitorService(monitor).serve(socket_path)
+            except RuntimeError as e:
+                print(f"❌ {e}")
             
         else:
             print("❌ Unknown command")
-            print("\nUsage:")
-            print("  python file_integrity_monitor.py init              - Initialize baseline")
-            print("  python file_integrity_monitor.py check             - Run single check")
-            print("  python file_integrity_monitor.py monitor [seconds] - Continuous monitoring")
+            print_usage()
     else:
         print("\n🔒 File Integrity Monitor")
-        print("\nUsage:")
-        print("  python file_integrity_monitor.py init              - Initialize baseline")
-        print("  python file_integrity_monitor.py check             - Run single check")
-        print("  python file_integrity_monitor.py monitor [seconds] - Continuous monitoring")
+        print_usage()
         print("\nExample:")
         print("  python file_integrity_monitor.py init")
-        print("  python file_integrity_monitor.py check")
+        print("  python file_integrity_monitor.py check --verify fast")
+        print("  python file_integrity_monitor.py check --workers 8")
+        print("  python file_integrity_monitor.py migrate blake2b --precheck crc32")
+        print("  python file_integrity_monitor.py import-json hash_db.json --db hash_db.sqlite3")
         print("  python file_integrity_monitor.py monitor 30")
+        print("  python file_integrity_monitor.py monitor --watch --reconcile 1800")
+        print("  python file_integrity_monitor.py serve --verify fast --workers 8")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
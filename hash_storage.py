@@ -0,0 +1,141 @@
+import os
+import json
+import sqlite3
+
+# Backend penyimpanan hash database yang didukung
+STORAGE_BACKENDS = ("json", "sqlite")
+
+# Ekstensi file yang otomatis memakai backend SQLite
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+# Kolom tabel SQLite, sama dengan field record di hash_db
+RECORD_FIELDS = ('hash', 'algorithm', 'precheck_algorithm', 'precheck_hash',
+                 'size', 'mtime_ns', 'inode', 'ctime_ns', 'modified', 'created')
+
+# Jumlah baris per executemany saat menulis ke SQLite
+SQLITE_BATCH_SIZE = 10000
+
+
+class HashStore:
+    """Antarmuka dasar penyimpanan hash database (path relatif -> record dict)"""
+    backend = None
+
+    def __init__(self, path):
+        self.path = path
+
+    def exists(self):
+        """Cek apakah database sudah ada"""
+        return os.path.exists(self.path)
+
+    def load(self):
+        """Baca seluruh record, kembalikan dict path -> record"""
+        raise NotImplementedError
+
+    def save(self, hash_db, changed=None):
+        """Simpan hash_db; changed berisi path yang berubah sejak load/save terakhir.
+
+        changed None berarti seluruh database ditulis ulang. Path di changed yang tidak
+        ada lagi di hash_db dihapus dari penyimpanan.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Tutup koneksi/resource yang dipakai backend"""
+        pass
+
+
+class JsonHashStore(HashStore):
+    """Penyimpanan dalam satu file JSON (format lama hash_db.json)"""
+    backend = "json"
+
+    def load(self):
+        with open(self.path, 'r') as f:
+            return json.load(f)
+
+    def save(self, hash_db, changed=None):
+        # JSON tidak bisa diperbarui sebagian, selalu tulis ulang seluruh file
+        with open(self.path, 'w') as f:
+            json.dump(hash_db, f, indent=2)
+
+
+class SqliteHashStore(HashStore):
+    """Penyimpanan SQLite (WAL) yang hanya menulis baris yang berubah"""
+    backend = "sqlite"
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._connection = None
+
+    def _connect(self):
+        """Buka koneksi (sekali) dan siapkan skema"""
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            columns = ", ".join(RECORD_FIELDS)
+            connection.execute(f"CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, {columns})")
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def load(self):
+        connection = self._connect()
+        columns = ", ".join(RECORD_FIELDS)
+        hash_db = {}
+        for row in connection.execute(f"SELECT path, {columns} FROM files"):
+            hash_db[row[0]] = {field: value for field, value in zip(RECORD_FIELDS, row[1:]) if value is not None}
+        return hash_db
+
+    def save(self, hash_db, changed=None):
+        connection = self._connect()
+
+        if changed is None:
+            upserts = hash_db.keys()
+            deletes = []
+        else:
+            upserts = [path for path in changed if path in hash_db]
+            deletes = [path for path in changed if path not in hash_db]
+
+        columns = ", ".join(RECORD_FIELDS)
+        placeholders = ", ".join("?" for _ in range(len(RECORD_FIELDS) + 1))
+        insert_sql = f"INSERT OR REPLACE INTO files (path, {columns}) VALUES ({placeholders})"
+
+        # Satu transaksi per save agar database tidak pernah setengah tertulis;
+        # baris dikirim per batch supaya memori tidak ikut membesar
+        with connection:
+            if changed is None:
+                connection.execute("DELETE FROM files")
+            for batch in _batches(deletes):
+                connection.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in batch])
+            for batch in _batches(upserts):
+                rows = [(path, *(hash_db[path].get(field) for field in RECORD_FIELDS)) for path in batch]
+                connection.executemany(insert_sql, rows)
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def _batches(items, size=SQLITE_BATCH_SIZE):
+    """Pecah iterable menjadi list-list berukuran maksimal size"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def open_hash_store(path, backend=None):
+    """Buat objek penyimpanan; backend None ditebak dari ekstensi file"""
+    if backend is None:
+        backend = "sqlite" if str(path).lower().endswith(SQLITE_EXTENSIONS) else "json"
+
+    if backend == "json":
+        return JsonHashStore(path)
+    elif backend == "sqlite":
+        return SqliteHashStore(path)
+    raise ValueError(f"Unknown storage backend: {backend} (choose from {', '.join(STORAGE_BACKENDS)})")
@@ -0,0 +1,163 @@
+import os
+import sys
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+
+# Konstanta dari <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+# Event yang bisa mengubah isi, metadata, atau keberadaan file
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+def _load_libc():
+    """Load libc dan pastikan fungsi inotify tersedia (hanya Linux)"""
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        raise OSError(errno.ENOSYS, "libc has no inotify support")
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    return libc
+
+
+class InotifyWatcher:
+    """Pantau satu tree direktori secara rekursif lewat inotify Linux (tanpa dependency).
+
+    recursive=False hanya memantau root itu sendiri (misalnya direktori file log).
+    """
+
+    def __init__(self, root, recursive=True):
+        self.root = os.path.abspath(root)
+        self.recursive = recursive
+        self._libc = _load_libc()
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify_init1 failed: {os.strerror(error)}")
+
+        # watch descriptor -> path direktori absolut
+        self._watches = {}
+        # True jika antrean event kernel penuh; pemanggil harus memindai ulang penuh
+        self.overflowed = False
+
+        if recursive:
+            self._add_tree(self.root)
+        else:
+            self._add_watch(self.root)
+
+    def _add_watch(self, directory):
+        """Tambah watch untuk satu direktori"""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            # Direktori bisa sudah hilang lagi sebelum sempat di-watch
+            if error in (errno.ENOENT, errno.ENOTDIR):
+                return
+            raise OSError(error, f"inotify_add_watch failed for {directory}: {os.strerror(error)}")
+        self._watches[wd] = directory
+
+    def _add_tree(self, directory):
+        """Watch direktori beserta seluruh subdirektorinya, kembalikan file yang sudah ada di dalamnya"""
+        existing_files = []
+        self._add_watch(directory)
+        for current, dirs, files in os.walk(directory):
+            for name in dirs:
+                self._add_watch(os.path.join(current, name))
+            existing_files.extend(os.path.join(current, name) for name in files)
+        return existing_files
+
+    def _remove_tree(self, directory):
+        """Lepas watch untuk direktori beserta seluruh subdirektorinya"""
+        prefix = directory + os.sep
+        for wd, path in list(self._watches.items()):
+            if path == directory or path.startswith(prefix):
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+
+    def fileno(self):
+        return self._fd
+
+    def read_events(self, timeout=None):
+        """Tunggu event sampai timeout detik, kembalikan list path absolut yang tersentuh.
+
+        Direktori baru langsung di-watch; file yang sudah terlanjur dibuat di dalamnya
+        sebelum watch terpasang ikut dikembalikan agar tidak terlewat.
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+
+        touched = []
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            touched.extend(self._parse_events(data))
+
+        return touched
+
+    def _parse_events(self, data):
+        """Urai buffer struct inotify_event menjadi path yang tersentuh"""
+        touched = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, name_length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + name_length].rstrip(b"\0")
+            offset += name_length
+
+            if mask & IN_Q_OVERFLOW:
+                self.overflowed = True
+                continue
+
+            directory = self._watches.get(wd)
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            if directory is None:
+                continue
+
+            path = os.path.join(directory, os.fsdecode(name)) if name else directory
+            touched.append(path)
+
+            if not self.recursive:
+                continue
+            # Subdirektori baru (dibuat atau dipindah masuk) langsung ikut dipantau
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                touched.extend(self._add_tree(path))
+            # Watch mengikuti direktori yang dipindah, jadi lepas agar path tidak basi
+            elif mask & IN_ISDIR and mask & IN_MOVED_FROM:
+                self._remove_tree(path)
+
+        return touched
+
+    def close(self):
+        """Tutup file descriptor inotify"""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
@@ -1,64 +1,695 @@
+import os
 import re
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from collections import Counter
+from collections import Counter, deque
+
+from log_store import (ColumnarLogStore, TimeIndex, TimeSeries, TIMESERIES_RESOLUTIONS, to_epoch, from_epoch,
+                       extract_file_name)
+from file_history import FileHistoryIndex, classify_file_event
+from log_segments import load_manifest, open_segment, segment_path, segment_overlaps
+
+LOG_PATTERN = re.compile(r'\[(.*?)\] (.*?): (.*)')
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+ANOMALY_LEVELS = ('WARNING', 'ALERT')
+
+# Jumlah anomali terakhir yang disimpan untuk laporan
+RECENT_ANOMALIES = 5
+
+# Jumlah entry terakhir yang disimpan untuk dashboard
+RECENT_LOGS = 10
+
+# Jenis event yang dihitung di TimeSeries (nama event -> nama seri)
+SERIES_EVENTS = {'verified': 'verified', 'modified': 'failed', 'new': 'new', 'deleted': 'deleted'}
+
+# Bagian log lebih kecil dari ini selalu di-parse serial (overhead proses lebih besar)
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+# Jumlah potongan per worker agar beban tetap seimbang walau kepadatan baris berbeda
+CHUNKS_PER_JOB = 4
+
+# Nama file aktif yang dipindah LogWriter._rotate: <log>.<YYYYmmdd-HHMMSS>[-n]
+ROTATED_NAME = r'\.(\d{8}-\d{6})(?:-(\d+))?'
+
+# Bucket menit time_index yang dipertahankan (dari timestamp terakhir); yang lebih lama digabung per jam
+TIME_INDEX_MINUTES = 7 * 24 * 60
+
+# Jeda minimum (detik) antar penyimpanan state_file saat refresh berulang
+STATE_SAVE_INTERVAL = 30
+
+# Batas waktu (detik) menunggu writer selesai mengompresi segmen sebelum log dianggap diganti
+ROTATION_WAIT_TIMEOUT = 30
+
+
+def _parse_timestamp_slow(timestamp_str):
+    try:
+        return datetime.strptime(timestamp_str, TIMESTAMP_FORMAT)
+    except ValueError:
+        return None
+
+
+_last_timestamp = (None, None)
+
+
+def parse_timestamp(timestamp_str):
+    """Parse timestamp 'YYYY-MM-DD HH:MM:SS' tanpa strptime (None jika tidak valid).
+    
+    Baris log yang berurutan biasanya berbagi detik yang sama, jadi hasil terakhir
+    di-cache. Format lain jatuh kembali ke strptime agar hasilnya tetap sama.
+    """
+    global _last_timestamp
+    # Baca tuple cache sekali: thread lain bisa menggantinya di antara dua akses
+    cached_str, cached = _last_timestamp
+    if cached_str == timestamp_str:
+        return cached
+    
+    s = timestamp_str
+    if (len(s) == 19 and s[4] == '-' and s[7] == '-' and s[10] == ' ' and s[13] == ':' and s[16] == ':'
+            and (s[:4] + s[5:7] + s[8:10] + s[11:13] + s[14:16] + s[17:]).isdigit()):
+        try:
+            timestamp = datetime(int(s[:4]), int(s[5:7]), int(s[8:10]),
+                                 int(s[11:13]), int(s[14:16]), int(s[17:]))
+        except ValueError:
+            timestamp = None
+    else:
+        timestamp = _parse_timestamp_slow(s)
+    
+    _last_timestamp = (timestamp_str, timestamp)
+    return timestamp
+
+
+def _parse_json_line(line):
+    """Parse baris JSON lines ({timestamp, level, event, file, message})"""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(record, dict) or not isinstance(record.get('level'), str):
+        return None
+    
+    # Record dengan tipe field yang salah dilewati seperti baris teks yang tidak cocok
+    message = record.get('message', '')
+    event = record.get('event')
+    file_name = record.get('file')
+    if not isinstance(message, str) or not isinstance(event, (str, type(None))) or \
+            not isinstance(file_name, (str, type(None))):
+        return None
+    
+    timestamp = record.get('timestamp')
+    return {
+        'timestamp': parse_timestamp(timestamp) if isinstance(timestamp, str) else None,
+        'level': record['level'],
+        'message': message,
+        'raw': line,
+        'event': event,
+        'file': file_name
+    }
+
+
+def parse_line(line):
+    """Parse satu baris log menjadi dict entry (None jika format tidak cocok).
+    
+    Format teks setara dengan LOG_PATTERN.match, tetapi memakai str.find: timestamp
+    berakhir di '] ' pertama dan level di ': ' pertama setelahnya. Baris yang diawali
+    '{' dibaca sebagai JSON lines; entry-nya punya field tambahan 'event' dan 'file'.
+    """
+    line = line.strip()
+    if line.startswith('{'):
+        return _parse_json_line(line)
+    if not line.startswith('['):
+        return None
+    timestamp_end = line.find('] ', 1)
+    if timestamp_end == -1:
+        return None
+    level_end = line.find(': ', timestamp_end + 2)
+    if level_end == -1:
+        return None
+    
+    return {
+        'timestamp': parse_timestamp(line[1:timestamp_end]),
+        'level': line[timestamp_end + 2:level_end],
+        'message': line[level_end + 2:],
+        'raw': line
+    }
+
+
+def _read_stream(f, offset):
+    """Generator (offset_setelah_baris, entry atau None) dari stream yang sudah di posisi offset"""
+    for raw_line in f:
+        # Baris terakhir yang belum selesai ditulis dibaca pada kesempatan berikutnya
+        if not raw_line.endswith(b'\n'):
+            break
+        offset += len(raw_line)
+        yield offset, parse_line(raw_line.decode('utf-8', errors='replace'))
+
+
+def _skip_bytes(f, count):
+    """Lewati count byte dari stream yang tidak bisa di-seek (segmen terkompresi)"""
+    while count > 0:
+        data = f.read(min(count, 1024 * 1024))
+        if not data:
+            break
+        count -= len(data)
+
+
+def _read_entries(log_file, offset=0, segments=None):
+    """Generator: yield (offset_setelah_baris, entry atau None) untuk tiap baris lengkap.
+    
+    Offset bersifat global: segmen hasil rotasi (urutan manifest) dianggap tersambung
+    di depan file log aktif, dengan panjang sesuai ukuran sebelum dikompresi.
+    segments None berarti manifest dibaca dari disk.
+    """
+    if segments is None:
+        segments = load_manifest(log_file)
+    
+    base = 0
+    for segment in segments:
+        end = base + segment['bytes']
+        if offset < end:
+            with open_segment(segment_path(log_file, segment), segment['compression']) as f:
+                _skip_bytes(f, offset - base)
+                yield from _read_stream(f, offset)
+            offset = end
+        base = end
+    
+    with open(log_file, 'rb') as f:
+        f.seek(offset - base)
+        for line_end, entry in _read_stream(f, offset - base):
+            yield base + line_end, entry
+
+
+def iter_logs(log_file, offset=0):
+    """Generator entry log yang dibaca secara lazy (memori konstan, cocok untuk log multi-GB).
+    
+    Segmen yang sudah dirotasi ikut dibaca lebih dulu, urut dari yang terlama.
+    """
+    for _, entry in _read_entries(log_file, offset):
+        if entry:
+            yield entry
+
+
+def entry_to_state(entry):
+    """Serialisasi satu entry ke dict JSON"""
+    return {**entry, 'timestamp': entry['timestamp'].isoformat() if entry['timestamp'] else None}
+
+
+def entry_event(entry):
+    """Jenis event entry: field 'event' (log JSON) atau dari teks setelah nama file.
+    
+    Teks dicocokkan sebagai prefix setelah 'File "<nama>" ', sehingga nama file seperti
+    "deleted_items.txt" tidak lagi terhitung sebagai event deleted. None untuk baris
+    teks yang tidak menyebut file.
+    """
+    event = entry.get('event')
+    if event is None:
+        file_name = extract_file_name(entry['message'])
+        if file_name is not None:
+            event = classify_file_event(entry['message'], file_name)
+    return event
+
+
+def entry_from_state(state):
+    """Kebalikan entry_to_state"""
+    timestamp = datetime.fromisoformat(state['timestamp']) if state['timestamp'] else None
+    return {**state, 'timestamp': timestamp}
+
+
+class LogStatistics:
+    """Agregat statistik log yang diperbarui per entry, tanpa perlu menyimpan seluruh log"""
+    
+    def __init__(self):
+        self.total_logs = 0
+        self.level_counts = Counter()
+        self.safe_files = 0
+        self.failed_files = 0
+        self.new_files = 0
+        self.deleted_files = 0
+        self.anomaly_count = 0
+        self.last_anomaly = None
+        self.recent_anomalies = deque(maxlen=RECENT_ANOMALIES)
+        self.timeseries = TimeSeries()
+        # parse_timestamp mengembalikan objek yang sama untuk detik yang sama
+        self._timestamp = None
+        self._epoch = None
+    
+    def add(self, entry):
+        """Perbarui agregat dengan satu entry log"""
+        self.total_logs += 1
+        self.level_counts[entry['level']] += 1
+        
+        # Hitung status file dari jenis event (bukan substring di seluruh pesan)
+        event = entry_event(entry)
+        if event == 'verified':
+            self.safe_files += 1
+        elif event == 'modified':
+            self.failed_files += 1
+        elif event == 'new':
+            self.new_files += 1
+        elif event == 'deleted':
+            self.deleted_files += 1
+        timestamp = entry['timestamp']
+        if timestamp:
+            if timestamp is not self._timestamp:
+                self._timestamp, self._epoch = timestamp, to_epoch(timestamp)
+            self.timeseries.add(self._epoch, entry['level'], SERIES_EVENTS.get(event))
+        
+        # Waktu terakhir anomali
+        if entry['level'] in ANOMALY_LEVELS:
+            self.anomaly_count += 1
+            self.last_anomaly = entry['timestamp']
+            self.recent_anomalies.append(entry)
+    
+    def merge(self, other):
+        """Gabungkan agregat bagian log sesudahnya (other) ke agregat ini"""
+        self.total_logs += other.total_logs
+        self.level_counts.update(other.level_counts)
+        self.safe_files += other.safe_files
+        self.failed_files += other.failed_files
+        self.new_files += other.new_files
+        self.deleted_files += other.deleted_files
+        self.timeseries.merge(other.timeseries)
+        if other.anomaly_count:
+            self.anomaly_count += other.anomaly_count
+            self.last_anomaly = other.last_anomaly
+            self.recent_anomalies.extend(other.recent_anomalies)
+    
+    def to_dict(self):
+        """Hasil dalam format get_statistics (None jika belum ada log)"""
+        if not self.total_logs:
+            return None
+        
+        return {
+            'total_logs': self.total_logs,
+            'level_counts': dict(self.level_counts),
+            'safe_files': self.safe_files,
+            'failed_files': self.failed_files,
+            'new_files': self.new_files,
+            'deleted_files': self.deleted_files,
+            'last_anomaly': self.last_anomaly,
+            'anomaly_count': self.anomaly_count
+        }
+    
+    def to_state(self):
+        """Serialisasi agregat ke dict yang bisa disimpan sebagai JSON"""
+        state = self.to_dict() or {'total_logs': 0, 'level_counts': {}}
+        state['last_anomaly'] = self.last_anomaly.isoformat() if self.last_anomaly else None
+        state['recent_anomalies'] = [entry_to_state(entry) for entry in self.recent_anomalies]
+        state['timeseries'] = self.timeseries.to_state()
+        return state
+    
+    @classmethod
+    def from_state(cls, state):
+        """Bangun kembali agregat dari hasil to_state"""
+        stats = cls()
+        stats.total_logs = state.get('total_logs', 0)
+        stats.level_counts = Counter(state.get('level_counts', {}))
+        stats.safe_files = state.get('safe_files', 0)
+        stats.failed_files = state.get('failed_files', 0)
+        stats.new_files = state.get('new_files', 0)
+        stats.deleted_files = state.get('deleted_files', 0)
+        stats.anomaly_count = state.get('anomaly_count', 0)
+        if state.get('last_anomaly'):
+            stats.last_anomaly = datetime.fromisoformat(state['last_anomaly'])
+        stats.recent_anomalies.extend(entry_from_state(entry) for entry in state.get('recent_anomalies', []))
+        stats.timeseries = TimeSeries.from_state(state.get('timeseries', {}))
+        return stats
+
+
+def _split_ranges(log_file, start, end, count):
+    """Bagi [start, end) file log menjadi maksimal count rentang yang berbatas awal baris"""
+    bounds = [start]
+    with open(log_file, 'rb') as f:
+        for i in range(1, count):
+            position = start + (end - start) * i // count
+            if position <= bounds[-1]:
+                continue
+            f.seek(position - 1)
+            f.readline()
+            position = f.tell()
+            if position >= end:
+                break
+            if position > bounds[-1]:
+                bounds.append(position)
+    bounds.append(end)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _parse_chunk(log_file, start, end, base):
+    """Worker: parse baris lengkap di [start, end) file aktif menjadi agregat parsial.
+    
+    Kembalikan (LogStatistics, entry terakhir, TimeIndex bucket, offset lokal setelah
+    baris terakhir yang lengkap). base adalah offset global awal file aktif.
+    """
+    stats = LogStatistics()
+    recent_logs = deque(maxlen=RECENT_LOGS)
+    time_index = TimeIndex(per_line=False)
+    offset = start
+    with open(log_file, 'rb') as f:
+        f.seek(start)
+        line_offset = start
+        for offset, entry in _read_stream(f, start):
+            if offset > end:
+                offset = line_offset
+                break
+            if entry:
+                if entry['timestamp']:
+                    time_index.add(to_epoch(entry['timestamp']), base + line_offset)
+                recent_logs.append(entry)
+                stats.add(entry)
+            line_offset = offset
+    return stats, list(recent_logs), time_index, offset
+
 
 class LogAnalyzer:
-    def __init__(self, log_file="security.log"):
+    def __init__(self, log_file="security.log", state_file=None, keep_logs=True, columnar=False,
+                 history_file=None, jobs=1):
+        """Analyzer log; parsing bersifat incremental (lihat refresh).
+        
+        Jika state_file diberikan, offset terakhir, inode, dan agregat statistik disimpan
+        ke file tersebut sehingga analyzer baru hanya membaca baris yang ditambahkan sejak
+        run sebelumnya. Dalam mode ini self.logs hanya berisi entry yang dibaca oleh proses
+        ini, sedangkan get_statistics tetap mencakup seluruh riwayat.
+        
+        keep_logs=False tidak menyimpan entry di self.logs (memori konstan); statistik,
+        anomali terakhir, dan recent_logs tetap tersedia, query lain membaca ulang file.
+        
+        columnar=True menyimpan entry di ColumnarLogStore (array per kolom, jauh lebih
+        hemat memori daripada list of dict) dan filter level/tanggal berjalan per kolom.
+        
+        Query rentang tanggal memakai TimeIndex: time_index (bucket per menit atas
+        seluruh file, ikut disimpan di state) untuk seek ke file log, dan index per
+        baris atas self.logs jika keep_logs.
+        
+        history_file (SQLite) mengaktifkan FileHistoryIndex: riwayat event per file
+        diperbarui secara incremental saat parsing dan dipakai get_file_history.
+        
+        Segmen hasil rotasi (lihat log_segments) dibaca transparan sebelum file aktif;
+        semua offset bersifat global atas gabungan segmen dan file aktif. Dalam mode
+        streaming, segmen yang belum pernah dibaca diringkas dari manifest tanpa
+        dekompresi, dan query tanggal melewati segmen di luar rentang.
+        
+        jobs > 1 mem-parse bagian file aktif yang belum dibaca secara paralel di process
+        pool (rentang byte per baris, agregat parsial digabung berurutan). Hanya dipakai
+        pada mode streaming tanpa history_file, karena entry tidak dikirim balik.
+        """
         self.log_file = log_file
-        self.logs = []
+        self.state_file = state_file
+        self.keep_logs = keep_logs
+        self.columnar = columnar
+        self.jobs = max(1, jobs)
+        self.logs = self._new_log_store()
+        self.recent_logs = deque(maxlen=RECENT_LOGS)
+        self.stats = LogStatistics()
+        self.time_index = TimeIndex(per_line=False)
+        self._logs_index = TimeIndex() if keep_logs else None
+        self._offset = 0
+        self._inode = None
+        self._rotation_wait_started = None
+        self._state_saved = None
+        self._saved_position = None
+        # Total ukuran segmen di manifest dan offset awal cakupan time_index
+        self._base = 0
+        self._indexed_from = 0
+        self.history = FileHistoryIndex(history_file, log_file) if history_file else None
+        
+        if state_file:
+            self._load_state()
         self._parse_logs()
     
+    def _load_state(self):
+        """Load offset, inode, dan agregat dari state_file"""
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+            # State tanpa time_index/timeseries (versi lama) diabaikan agar index mencakup seluruh file
+            if (state.get('log_file') == os.path.abspath(self.log_file) and 'time_index' in state
+                    and 'timeseries' in state['stats']):
+                self._offset = state['offset']
+                self._inode = state['inode']
+                self._base = state.get('base', 0)
+                self._indexed_from = state.get('indexed_from', 0)
+                self.stats = LogStatistics.from_state(state['stats'])
+                self.time_index = TimeIndex.from_state(state['time_index'])
+                self.recent_logs.extend(entry_from_state(entry) for entry in state.get('recent_logs', []))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️  Ignoring analyzer state '{self.state_file}': {str(e)}")
+    
+    def _state_due(self):
+        """True jika state_file perlu ditulis ulang.
+        
+        Refresh berulang (dashboard) tidak menulis ulang state tiap kali: setelah penyimpanan
+        pertama, state hanya ditulis jika posisi baca berubah dan STATE_SAVE_INTERVAL sudah lewat.
+        Setelah restart, bagian log sesudah state terakhir cukup dibaca ulang.
+        """
+        if self._state_saved is None:
+            return True
+        return (self._saved_position != (self._inode, self._offset)
+                and time.monotonic() - self._state_saved >= STATE_SAVE_INTERVAL)
+    
+    def _save_state(self):
+        """Simpan offset, inode, dan agregat ke state_file (ditulis atomik lewat file sementara)"""
+        self._state_saved = time.monotonic()
+        self._saved_position = (self._inode, self._offset)
+        temp_path = f"{self.state_file}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump({
+                    'log_file': os.path.abspath(self.log_file),
+                    'offset': self._offset,
+                    'inode': self._inode,
+                    'base': self._base,
+                    'indexed_from': self._indexed_from,
+                    'stats': self.stats.to_state(),
+                    'time_index': self.time_index.to_state(),
+                    'recent_logs': [entry_to_state(entry) for entry in self.recent_logs]
+                }, f)
+            os.replace(temp_path, self.state_file)
+        except Exception as e:
+            print(f"⚠️  Could not save analyzer state: {str(e)}")
+    
+    def _new_log_store(self):
+        """Wadah entry di memori sesuai mode penyimpanan"""
+        return ColumnarLogStore(parse_line) if self.columnar else []
+    
+    def _reset(self):
+        """Lupakan semua yang sudah dibaca (log dirotasi atau dipotong)"""
+        self.logs = self._new_log_store()
+        self.recent_logs.clear()
+        self.stats = LogStatistics()
+        self.time_index = TimeIndex(per_line=False)
+        self._logs_index = TimeIndex() if self.keep_logs else None
+        self._offset = 0
+        self._indexed_from = 0
+        if self.history:
+            self.history.clear()
+    
+    def _index_entry(self, entry, line_offset):
+        """Masukkan satu entry ke time index dan riwayat per file"""
+        epoch = to_epoch(entry['timestamp']) if entry['timestamp'] else None
+        if epoch is not None:
+            self.time_index.add(epoch, line_offset)
+            if self.keep_logs:
+                self._logs_index.add(epoch, line_offset, len(self.logs))
+        
+        # Baris yang sudah diindex pada run sebelumnya tidak perlu ditulis lagi
+        if self.history and line_offset >= self.history.offset:
+            self._add_history(entry, line_offset, epoch)
+    
+    def _add_history(self, entry, line_offset, epoch):
+        file_name = entry.get('file') or extract_file_name(entry['message'])
+        if file_name is not None:
+            self.history.add(line_offset, file_name, entry['level'], entry_event(entry), epoch)
+    
+    def _backfill_history(self, segments):
+        """Index riwayat baris yang sudah dilewati (state_file/manifest) tetapi belum ada di history"""
+        line_offset = self.history.offset
+        for line_end, entry in _read_entries(self.log_file, line_offset, segments):
+            if line_end > self._offset:
+                break
+            if entry:
+                epoch = to_epoch(entry['timestamp']) if entry['timestamp'] else None
+                self._add_history(entry, line_offset, epoch)
+            line_offset = line_end
+        self.history.commit(line_offset)
+    
+    def _rotation_pending(self, segments):
+        """True jika ada file aktif lama yang sudah dipindah writer tetapi belum tercatat di manifest.
+        
+        Writer mengompresi segmen di thread terpisah, jadi bisa ada beberapa file yang menunggu.
+        Hanya nama hasil LogWriter._rotate yang lebih baru dari segmen terakhir di manifest yang
+        dihitung; rotasi dari luar (misalnya logrotate ke security.log.1) tidak pernah dicatat.
+        """
+        rotated = re.compile(re.escape(os.path.basename(self.log_file)) + ROTATED_NAME)
+        
+        def order(match):
+            return match.group(1), int(match.group(2) or 0)
+        
+        last = rotated.match(segments[-1]['file']) if segments else None
+        for name in os.listdir(os.path.dirname(os.path.abspath(self.log_file))):
+            match = rotated.fullmatch(name)
+            if match and (last is None or order(match) > order(last)):
+                return True
+        return False
+    
+    def _rotation_wait_expired(self):
+        """True jika sudah menunggu rotasi writer lebih dari ROTATION_WAIT_TIMEOUT detik"""
+        now = time.monotonic()
+        if self._rotation_wait_started is None:
+            self._rotation_wait_started = now
+        return now - self._rotation_wait_started >= ROTATION_WAIT_TIMEOUT
+    
+    def _continues_into(self, segments):
+        """True jika file yang terakhir dibaca kini menjadi segmen yang dimulai di offset _base"""
+        start = 0
+        for segment in segments:
+            if start == self._base:
+                return segment.get('inode') == self._inode
+            start += segment['bytes']
+        return False
+    
+    def _skip_segments(self, segments):
+        """Ringkas segmen yang belum dibaca sama sekali dari manifest (tanpa dekompresi)"""
+        base = 0
+        for segment in segments:
+            if self._offset == base and 'stats' in segment:
+                self.stats.merge(LogStatistics.from_state(segment['stats']))
+                self.recent_logs.extend(entry_from_state(entry) for entry in segment.get('recent_logs', []))
+                self._offset = self._indexed_from = base + segment['bytes']
+            base += segment['bytes']
+    
     def _parse_logs(self):
-        """Parse file log dan ekstrak informasi"""
+        """Parse bagian file log yang belum dibaca dan perbarui agregat, kembalikan jumlah entry baru"""
+        new_entries = 0
         try:
-            with open(self.log_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    match = re.match(r'\[(.*?)\] (.*?): (.*)', line.strip())
-                    if match:
-                        timestamp_str, level, message = match.groups()
-                        try:
-                            timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-                        except:
-                            timestamp = None
-                        
-                        self.logs.append({
-                            'timestamp': timestamp,
-                            'level': level,
-                            'message': message,
-                            'raw': line.strip()
-                        })
+            segments = load_manifest(self.log_file)
+            base = sum(segment['bytes'] for segment in segments)
+            file_stat = os.stat(self.log_file)
+            
+            if self._inode is not None:
+                if base < self._base:
+                    self._reset()
+                elif base > self._base or file_stat.st_ino != self._inode:
+                    # Writer merotasi log: offset global tetap berlaku jika file yang terakhir dibaca
+                    # kini segmen di offset _base dan semua file yang dipindah sudah tercatat.
+                    # Selama writer masih mengompresi, baca lagi setelah manifest diperbarui
+                    if self._rotation_pending(segments):
+                        if not self._rotation_wait_expired():
+                            return 0
+                        self._reset()
+                    elif not self._continues_into(segments):
+                        self._reset()
+                self._rotation_wait_started = None
+                if base + file_stat.st_size < self._offset:
+                    self._reset()
+            self._inode = file_stat.st_ino
+            self._base = base
+            
+            if not self.keep_logs and self.time_index.count == 0:
+                self._skip_segments(segments)
+            if self.history:
+                self.history.sync(file_stat.st_ino, base, file_stat.st_size)
+                if self.history.offset < self._offset:
+                    self._backfill_history(segments)
+            
+            if self._can_parse_parallel(base, file_stat.st_size):
+                new_entries += self._parse_parallel(base, file_stat.st_size)
+            
+            line_offset = self._offset
+            for self._offset, entry in _read_entries(self.log_file, self._offset, segments):
+                if entry:
+                    self._index_entry(entry, line_offset)
+                    if self.keep_logs:
+                        self.logs.append(entry)
+                    self.recent_logs.append(entry)
+                    self.stats.add(entry)
+                    new_entries += 1
+                line_offset = self._offset
+            
+            if self.history:
+                self.history.commit(self._offset)
+            if self.time_index.last_epoch is not None:
+                self.time_index.compact(self.time_index.last_epoch - TIME_INDEX_MINUTES * 60)
+            if self.state_file and self._state_due():
+                self._save_state()
         except FileNotFoundError:
             print(f"⚠️  Log file '{self.log_file}' not found!")
         except Exception as e:
             print(f"❌ Error parsing log: {str(e)}")
+        return new_entries
+    
+    def _can_parse_parallel(self, base, size):
+        return (self.jobs > 1 and not self.keep_logs and self.history is None
+                and self._offset >= base and size - (self._offset - base) >= PARALLEL_MIN_BYTES)
+    
+    def _parse_parallel(self, base, size):
+        """Parse [offset, size) file aktif di process pool lalu gabungkan hasil sesuai urutan"""
+        ranges = _split_ranges(self.log_file, self._offset - base, size, self.jobs * CHUNKS_PER_JOB)
+        new_entries = 0
+        with ProcessPoolExecutor(max_workers=self.jobs) as executor:
+            futures = [executor.submit(_parse_chunk, self.log_file, start, end, base) for start, end in ranges]
+            for future in futures:
+                stats, recent_logs, time_index, end = future.result()
+                self.stats.merge(stats)
+                self.recent_logs.extend(recent_logs)
+                self.time_index.extend(time_index)
+                new_entries += stats.total_logs
+                self._offset = base + end
+        return new_entries
+    
+    def refresh(self):
+        """Baca hanya baris yang ditambahkan sejak parse terakhir (O(baris baru))"""
+        return self._parse_logs()
+    
+    @property
+    def offset(self):
+        """Offset global setelah baris lengkap terakhir yang sudah dibaca"""
+        return self._offset
     
     def get_statistics(self):
         """Dapatkan statistik dari log"""
-        if not self.logs:
-            return None
-        
-        level_counts = Counter([log['level'] for log in self.logs])
+        return self.stats.to_dict()
+    
+    def get_timeseries(self, resolution="hour", start_date=None, end_date=None):
+        """Jumlah log per bucket (minute/hour/day) untuk tiap level dan event, urut waktu.
         
-        # Hitung file aman dan rusak
-        safe_files = sum(1 for log in self.logs if 'verified OK' in log['message'])
-        failed_files = sum(1 for log in self.logs if 'integrity failed' in log['message'])
-        new_files = sum(1 for log in self.logs if 'Unknown file' in log['message'] or 'detected' in log['message'])
-        deleted_files = sum(1 for log in self.logs if 'deleted' in log['message'] or 'missing' in log['message'])
+        Dihitung dari counter yang diperbarui saat parsing, jadi biayanya sebanding dengan
+        jumlah bucket di rentang, bukan jumlah baris. Bucket kosong tidak dikembalikan.
+        """
+        resolutions = [name for name, _, _ in TIMESERIES_RESOLUTIONS]
+        if resolution not in resolutions:
+            raise ValueError(f"Unknown resolution: {resolution} (choose from {', '.join(resolutions)})")
         
-        # Waktu terakhir anomali
-        anomalies = [log for log in self.logs if log['level'] in ['WARNING', 'ALERT']]
-        last_anomaly = anomalies[-1]['timestamp'] if anomalies else None
+        start = to_epoch(start_date) if start_date else None
+        end = to_epoch(end_date) if end_date else None
+        return [{
+            'start': from_epoch(bucket),
+            'levels': dict(levels),
+            'events': dict(events)
+        } for bucket, levels, events in self.stats.timeseries.query(resolution, start, end)]
+    
+    def get_recent_anomalies(self):
+        """Anomali (WARNING/ALERT) terakhir, dari yang terlama ke terbaru"""
+        return list(self.stats.recent_anomalies)
+    
+    def iter_logs(self):
+        """Iterasi semua entry; dari memori jika keep_logs, selain itu dibaca ulang dari file"""
+        if self.keep_logs:
+            return iter(self.logs)
+        return self._iter_file_logs()
+    
+    def _iter_file_logs(self):
+        """iter_logs dari file; log yang belum ada (atau hilang saat dibaca) dianggap kosong.
         
-        return {
-            'total_logs': len(self.logs),
-            'level_counts': dict(level_counts),
-            'safe_files': safe_files,
-            'failed_files': failed_files,
-            'new_files': new_files,
-            'deleted_files': deleted_files,
-            'last_anomaly': last_anomaly,
-            'anomaly_count': len(anomalies)
-        }
+        FileNotFoundError baru muncul saat generator diiterasi, jadi ditangkap di sini.
+        """
+        try:
+            yield from iter_logs(self.log_file)
+        except FileNotFoundError:
+            return
     
     def display_report(self):
         """Tampilkan laporan ke konsol"""
@@ -93,8 +724,7 @@ class LogAnalyzer:
         
         # Tampilkan log anomali terakhir
         print(f"\n⚠️  Recent Anomalies (last 5):")
-        anomalies = [log for log in self.logs if log['level'] in ['WARNING', 'ALERT']]
-        recent_anomalies = anomalies[-5:] if len(anomalies) > 0 else []
+        recent_anomalies = self.get_recent_anomalies()
         
         if recent_anomalies:
             for log in reversed(recent_anomalies):
@@ -104,22 +734,254 @@ class LogAnalyzer:
         
         print("\n" + "="*60 + "\n")
     
+    def _uses_columns(self):
+        return self.keep_logs and self.columnar
+    
+    def iter_logs_by_level(self, level):
+        """Generator log dengan level tertentu (tanpa membuat list)"""
+        if self._uses_columns():
+            return self.logs.entries(self.logs.level_indices(level))
+        return (log for log in self.iter_logs() if log['level'] == level)
+    
     def get_logs_by_level(self, level):
         """Dapatkan semua log dengan level tertentu"""
-        return [log for log in self.logs if log['level'] == level]
+        return list(self.iter_logs_by_level(level))
+    
+    def _in_range(self, entries, start_date, end_date):
+        return (log for log in entries if log['timestamp'] and start_date <= log['timestamp'] <= end_date)
+    
+    def _count_lines(self, offset, stop_offset, start, end):
+        """Hitung baris log di [offset, stop_offset) dengan start <= epoch <= end"""
+        count = 0
+        for line_end, entry in _read_entries(self.log_file, offset):
+            if stop_offset is not None and line_end > stop_offset:
+                break
+            if entry and entry['timestamp']:
+                epoch = to_epoch(entry['timestamp'])
+                if epoch > end:
+                    break
+                if epoch >= start:
+                    count += 1
+        return count
+    
+    def iter_logs_by_date_range(self, start_date, end_date):
+        """Generator log dalam rentang tanggal; memakai TimeIndex jika log berurutan waktu"""
+        start, end = to_epoch(start_date), to_epoch(end_date)
+        
+        if self.keep_logs:
+            if not self._logs_index.ordered:
+                return self._in_range(self.iter_logs(), start_date, end_date)
+            lo, hi = self._logs_index.line_range(start, end)
+            positions = self._logs_index.positions[lo:hi]
+            if self.columnar:
+                return self.logs.entries(positions)
+            return (self.logs[position] for position in positions)
+        
+        # Mode streaming: segmen sebelum cakupan time_index dipilih lewat manifest,
+        # sisanya seek ke bucket menit pertama lalu baca sampai lewat end_date
+        if not self.time_index.ordered:
+            return self._in_range(self.iter_logs(), start_date, end_date)
+        if start > end:
+            return iter(())
+        return self._seek_range(start_date, end_date)
+    
+    def _unindexed_segments(self, start_date, end_date):
+        """(offset awal, offset akhir, segmen) untuk segmen di luar time_index yang beririsan rentang"""
+        start, end = start_date.isoformat(), end_date.isoformat()
+        base = 0
+        for segment in load_manifest(self.log_file):
+            segment_end = base + segment['bytes']
+            if segment_end > self._indexed_from:
+                break
+            if segment_overlaps(segment, start, end):
+                yield base, segment_end, segment
+            base = segment_end
+    
+    def _read_range(self, offset, stop_offset):
+        """Generator entry di [offset, stop_offset) (stop_offset None = sampai akhir log)"""
+        for line_end, entry in _read_entries(self.log_file, offset):
+            if stop_offset is not None and line_end > stop_offset:
+                break
+            if entry:
+                yield entry
+    
+    def _seek_range(self, start_date, end_date):
+        for offset, stop_offset, _ in self._unindexed_segments(start_date, end_date):
+            yield from self._in_range(self._read_range(offset, stop_offset), start_date, end_date)
+        
+        offset = self.time_index.seek_offset(to_epoch(start_date))
+        if offset is None:
+            return
+        for entry in self._read_range(offset, None):
+            timestamp = entry['timestamp']
+            if not timestamp:
+                continue
+            if timestamp > end_date:
+                break
+            if timestamp >= start_date:
+                yield entry
     
     def get_logs_by_date_range(self, start_date, end_date):
         """Dapatkan log dalam rentang tanggal tertentu"""
-        return [log for log in self.logs 
-                if log['timestamp'] and start_date <= log['timestamp'] <= end_date]
+        if self._uses_columns() and not self._logs_index.ordered:
+            return list(self.logs.entries(self.logs.time_range_indices(start_date, end_date)))
+        return list(self.iter_logs_by_date_range(start_date, end_date))
+    
+    def get_file_history(self, file_name, start_date=None, end_date=None, limit=None):
+        """Semua event untuk satu file (urut waktu), opsional dibatasi rentang tanggal.
+        
+        Memakai FileHistoryIndex jika history_file diberikan (baris log dibaca langsung
+        lewat offset), selain itu scan seluruh log. Tiap item adalah entry log dengan
+        tambahan 'event' dan 'offset'.
+        """
+        if self.history is None:
+            return self._scan_file_history(file_name, start_date, end_date, limit)
+        
+        start = to_epoch(start_date) if start_date else None
+        end = to_epoch(end_date) if end_date else None
+        rows = self.history.query(file_name, start, end, limit)
+        lines = self._lines_at([row[0] for row in rows])
+        
+        history = []
+        for offset, level, event, epoch in rows:
+            entry = lines.get(offset)
+            if entry is None:
+                entry = {'timestamp': from_epoch(epoch) if epoch is not None else None,
+                         'level': level, 'message': None, 'raw': None}
+            history.append({**entry, 'event': event, 'offset': offset})
+        return history
+    
+    def _lines_at(self, offsets):
+        """Baca entry pada offset global tertentu: seek di file aktif, satu kali lewat di segmen"""
+        segments = load_manifest(self.log_file)
+        base = sum(segment['bytes'] for segment in segments)
+        lines = {}
+        
+        wanted = sorted(offset for offset in offsets if offset < base)
+        if wanted:
+            targets = set(wanted)
+            line_offset = wanted[0]
+            for line_end, entry in _read_entries(self.log_file, line_offset, segments):
+                if line_offset in targets:
+                    lines[line_offset] = entry
+                if line_end > wanted[-1]:
+                    break
+                line_offset = line_end
+        
+        with open(self.log_file, 'rb') as f:
+            for offset in offsets:
+                if offset >= base:
+                    f.seek(offset - base)
+                    lines[offset] = parse_line(f.readline().decode('utf-8', errors='replace'))
+        return lines
+    
+    def _scan_file_history(self, file_name, start_date, end_date, limit):
+        history = []
+        offset = 0
+        for line_end, entry in _read_entries(self.log_file):
+            if entry and (entry.get('file') or extract_file_name(entry['message'])) == file_name:
+                timestamp = entry['timestamp']
+                if (start_date is None or (timestamp and timestamp >= start_date)) and \
+                        (end_date is None or (timestamp and timestamp <= end_date)):
+                    history.append({**entry, 'event': entry_event(entry), 'offset': offset})
+                    if limit is not None and len(history) >= limit:
+                        break
+            offset = line_end
+        return history
+    
+    def count_logs_by_date_range(self, start_date, end_date):
+        """Jumlah log dalam rentang tanggal tanpa membuat entry (O(log n) jika berurutan)"""
+        start, end = to_epoch(start_date), to_epoch(end_date)
+        index = self._logs_index if self.keep_logs else self.time_index
+        if not index.ordered:
+            return sum(1 for _ in self._in_range(self.iter_logs(), start_date, end_date))
+        if self.keep_logs or start > end:
+            return index.count_range(start, end, self._count_lines)
+        
+        # Segmen yang seluruhnya berada di dalam rentang dihitung dari manifest
+        count = 0
+        for offset, stop_offset, segment in self._unindexed_segments(start_date, end_date):
+            if segment['start'] and segment['start'] >= start_date.isoformat() and \
+                    segment['end'] <= end_date.isoformat():
+                count += segment['timestamped']
+            else:
+                count += sum(1 for _ in self._in_range(self._read_range(offset, stop_offset),
+                                                       start_date, end_date))
+        return count + index.count_range(start, end, self._count_lines)
+    
+    def iter_logs_from(self, offset=0, level=None, start_date=None, end_date=None, path_prefix=None):
+        """Generator (offset awal baris, offset setelah baris, entry) mulai dari offset global.
+        
+        Dipakai untuk pagination: offset setelah baris terakhir yang dikirim menjadi cursor
+        halaman berikutnya. Filter opsional: level, rentang tanggal (inklusif), dan prefix
+        path file. Jika log berurutan waktu, start_date langsung seek lewat time_index
+        dan pembacaan berhenti setelah melewati end_date. Entry dibaca dari file (memori
+        konstan) dan seek dihitung saat pemanggilan, bukan saat generator pertama dipakai.
+        """
+        ordered = self.time_index.ordered
+        if start_date and ordered and offset >= self._indexed_from:
+            seek = self.time_index.seek_offset(to_epoch(start_date))
+            if seek is not None:
+                offset = max(offset, seek)
+        return self._filter_from(offset, level, start_date, end_date, path_prefix, ordered)
+    
+    def _filter_from(self, offset, level, start_date, end_date, path_prefix, ordered):
+        line_offset = offset
+        for line_end, entry in _read_entries(self.log_file, offset):
+            start, line_offset = line_offset, line_end
+            if not entry or (level and entry['level'] != level):
+                continue
+            timestamp = entry['timestamp']
+            if start_date or end_date:
+                if not timestamp or (start_date and timestamp < start_date):
+                    continue
+                if end_date and timestamp > end_date:
+                    if ordered:
+                        break
+                    continue
+            if path_prefix:
+                file_name = entry.get('file') or extract_file_name(entry['message'])
+                if file_name is None or not file_name.startswith(path_prefix):
+                    continue
+            yield start, line_end, entry
 
 
 def main():
     import sys
     
-    log_file = sys.argv[1] if len(sys.argv) > 1 else "security.log"
+    args = sys.argv[1:]
+    # --stream: jangan simpan seluruh log di memori (untuk log multi-GB)
+    keep_logs = "--stream" not in args
+    if not keep_logs:
+        args.remove("--stream")
     
-    analyzer = LogAnalyzer(log_file)
+    # --columnar: simpan entry per kolom (array) agar log besar muat di memori
+    columnar = "--columnar" in args
+    if columnar:
+        args.remove("--columnar")
+    
+    # --jobs [N]: parse log besar secara paralel (otomatis memakai mode streaming);
+    # tanpa angka setelahnya memakai jumlah CPU
+    jobs = 1
+    if "--jobs" in args:
+        index = args.index("--jobs")
+        if index + 1 < len(args) and args[index + 1].isdigit():
+            jobs = int(args[index + 1])
+            del args[index:index + 2]
+        else:
+            jobs = os.cpu_count() or 1
+            del args[index]
+        keep_logs = False
+    
+    state_file = None
+    if "--state" in args:
+        index = args.index("--state")
+        state_file = args[index + 1] if index + 1 < len(args) else None
+        del args[index:index + 2]
+    
+    log_file = args[0] if args else "security.log"
+    
+    analyzer = LogAnalyzer(log_file, state_file=state_file, keep_logs=keep_logs, columnar=columnar, jobs=jobs)
     analyzer.display_report()
     
     # Opsi untuk melihat detail
@@ -131,16 +993,17 @@ def main():
     try:
         choice = input("\nSelect option (1-3): ").strip()
         
+        # Jumlah diambil dari agregat, baris dicetak sambil dibaca (tanpa list di memori)
+        level_counts = analyzer.stats.level_counts
+        
         if choice == "1":
-            alerts = analyzer.get_logs_by_level("ALERT")
-            print(f"\n🚨 All ALERT logs ({len(alerts)}):")
-            for log in alerts:
+            print(f"\n🚨 All ALERT logs ({level_counts.get('ALERT', 0)}):")
+            for log in analyzer.iter_logs_by_level("ALERT"):
                 print(f"   {log['raw']}")
         
         elif choice == "2":
-            warnings = analyzer.get_logs_by_level("WARNING")
-            print(f"\n⚠️  All WARNING logs ({len(warnings)}):")
-            for log in warnings:
+            print(f"\n⚠️  All WARNING logs ({level_counts.get('WARNING', 0)}):")
+            for log in analyzer.iter_logs_by_level("WARNING"):
                 print(f"   {log['raw']}")
     except:
         pass
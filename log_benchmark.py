@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Benchmark LogAnalyzer pada log sintetis (default 1 juta baris)
+
+  python log_benchmark.py [lines] [store|parse|parallel]
+
+store: memori dan latensi query list of dict vs ColumnarLogStore
+       (contoh 10 juta baris: python log_benchmark.py 10000000 store)
+parse: parser dan statistik satu kali jalan vs implementasi awal (regex + strptime)
+parallel: parse streaming serial vs --jobs N (N = jumlah CPU)
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import tempfile
+from collections import Counter
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+
+from log_analyzer import LogAnalyzer, parse_line
+from log_store import np
+
+DEFAULT_LINES = 1000000
+
+# Jumlah nama file berbeda di log sintetis
+FILE_COUNT = 5000
+
+# (level, pesan, bobot) meniru baris yang ditulis FileIntegrityMonitor
+MESSAGE_MIX = [
+    ("INFO", "verified OK", 90),
+    ("WARNING", "integrity failed!", 5),
+    ("ALERT", "detected (Unknown file)", 3),
+    ("ALERT", "deleted (File missing)", 2),
+]
+
+
+def generate_log(path, lines, seed=42):
+    """Tulis log sintetis dengan format security.log, kembalikan (waktu awal, waktu akhir)"""
+    rng = random.Random(seed)
+    levels, messages, weights = zip(*MESSAGE_MIX)
+    choices = rng.choices(range(len(MESSAGE_MIX)), weights=weights, k=min(lines, 100000))
+    start = datetime(2024, 1, 1)
+    timestamp = start
+
+    with open(path, "w", encoding="utf-8") as f:
+        batch = []
+        for i in range(lines):
+            # Rata-rata 10 baris per detik
+            if i % 10 == 0:
+                timestamp += timedelta(seconds=1)
+                stamp = timestamp.strftime("%Y-%m-%d %H:%M:%S")
+            kind = choices[i % len(choices)]
+            name = f"dir_{i % 50}/file_{rng.randrange(FILE_COUNT)}.txt"
+            batch.append(f'[{stamp}] {levels[kind]}: File "{name}" {messages[kind]}')
+            if len(batch) >= 10000:
+                f.write("\n".join(batch) + "\n")
+                batch = []
+        if batch:
+            f.write("\n".join(batch) + "\n")
+
+    return start, timestamp
+
+
+def _rss_bytes():
+    """Resident set size proses saat ini (byte)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def measure_store(log_file, columnar, start_date, end_date):
+    """Muat log dengan satu mode penyimpanan lalu ukur memori dan query (dijalankan di proses terpisah)"""
+    rss_before = _rss_bytes()
+    analyzer, load_time = _timed(lambda: LogAnalyzer(log_file, columnar=columnar))
+    memory = _rss_bytes() - rss_before
+
+    if columnar:
+        count_levels = analyzer.logs.count_by_level
+    else:
+        count_levels = lambda: dict(Counter(log['level'] for log in analyzer.logs))
+
+    alerts, level_time = _timed(lambda: analyzer.get_logs_by_level("ALERT"))
+    in_range, range_time = _timed(lambda: analyzer.get_logs_by_date_range(start_date, end_date))
+    _, count_time = _timed(count_levels)
+
+    return {
+        'entries': len(analyzer.logs),
+        'memory': memory,
+        'load': load_time,
+        'by_level': level_time,
+        'by_date': range_time,
+        'count': count_time,
+        'alerts': len(alerts),
+        'in_range': len(in_range),
+    }
+
+
+def legacy_parse_line(line):
+    """Parser implementasi awal: re.match tanpa compile dan strptime per baris"""
+    match = re.match(r'\[(.*?)\] (.*?): (.*)', line.strip())
+    if not match:
+        return None
+    timestamp_str, level, message = match.groups()
+    try:
+        timestamp = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
+    except:
+        timestamp = None
+    return {'timestamp': timestamp, 'level': level, 'message': message, 'raw': line.strip()}
+
+
+def legacy_statistics(log_file):
+    """get_statistics + anomali display_report versi awal (list of dict, enam kali iterasi)"""
+    with open(log_file, 'r', encoding='utf-8') as f:
+        logs = [entry for entry in map(legacy_parse_line, f) if entry]
+
+    level_counts = Counter([log['level'] for log in logs])
+    safe_files = sum(1 for log in logs if 'verified OK' in log['message'])
+    failed_files = sum(1 for log in logs if 'integrity failed' in log['message'])
+    new_files = sum(1 for log in logs if 'Unknown file' in log['message'] or 'detected' in log['message'])
+    deleted_files = sum(1 for log in logs if 'deleted' in log['message'] or 'missing' in log['message'])
+    anomalies = [log for log in logs if log['level'] in ['WARNING', 'ALERT']]
+    last_anomaly = anomalies[-1]['timestamp'] if anomalies else None
+
+    # display_report membangun ulang list anomali
+    anomalies = [log for log in logs if log['level'] in ['WARNING', 'ALERT']]
+    recent_anomalies = anomalies[-5:]
+
+    return {
+        'total_logs': len(logs),
+        'level_counts': dict(level_counts),
+        'safe_files': safe_files,
+        'failed_files': failed_files,
+        'new_files': new_files,
+        'deleted_files': deleted_files,
+        'last_anomaly': last_anomaly,
+        'anomaly_count': len(anomalies)
+    }, recent_anomalies
+
+
+def fused_statistics(log_file):
+    """Statistik lewat LogAnalyzer saat ini (parser tanpa regex, agregasi satu kali jalan)"""
+    analyzer = LogAnalyzer(log_file, keep_logs=False)
+    return analyzer.get_statistics(), analyzer.get_recent_anomalies()
+
+
+def measure_parse(log_file):
+    """Bandingkan parser per baris dan statistik lengkap versi awal vs saat ini"""
+    with open(log_file, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+
+    results = {}
+    for name, parser, statistics in (("legacy", legacy_parse_line, legacy_statistics),
+                                     ("fused", parse_line, fused_statistics)):
+        _, parse_time = _timed(lambda: [parser(line) for line in lines])
+        (stats, recent), stats_time = _timed(lambda: statistics(log_file))
+        results[name] = {'parse': parse_time, 'stats': stats_time, 'result': (stats, recent)}
+    return results
+
+
+def _store_report(log_file, first, last):
+    # Rentang tanggal = 10% bagian tengah log
+    span = last - first
+    start_date = first + span * 0.45
+    end_date = first + span * 0.55
+
+    # Tiap mode di proses baru agar pengukuran memori tidak saling mempengaruhi
+    results = {}
+    for name, columnar in (("list", False), ("columnar", True)):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            results[name] = executor.submit(measure_store, log_file, columnar, start_date, end_date).result()
+
+    print(f"\n📦 Store (NumPy: {'yes' if np is not None else 'no, array fallback'})")
+    rows = [
+        ("memory (MB)", 'memory', lambda v: f"{v / (1024 * 1024):.1f}"),
+        ("load (s)", 'load', lambda v: f"{v:.2f}"),
+        ("by level (s)", 'by_level', lambda v: f"{v:.3f}"),
+        ("by date (s)", 'by_date', lambda v: f"{v:.3f}"),
+        ("count (s)", 'count', lambda v: f"{v:.3f}"),
+    ]
+
+    header = f"{'':>14} {'list':>12} {'columnar':>12}"
+    print(header)
+    print("-" * len(header))
+    for label, key, fmt in rows:
+        print(f"{label:>14} {fmt(results['list'][key]):>12} {fmt(results['columnar'][key]):>12}")
+
+    # Kedua mode harus memberi hasil query yang sama
+    for key in ('entries', 'alerts', 'in_range'):
+        if results['list'][key] != results['columnar'][key]:
+            print(f"❌ Result mismatch for {key}: {results['list'][key]} != {results['columnar'][key]}")
+
+
+def _parse_report(log_file):
+    results = measure_parse(log_file)
+
+    print("\n🧮 Parse + statistics")
+    header = f"{'':>14} {'legacy':>12} {'fused':>12} {'speedup':>10}"
+    print(header)
+    print("-" * len(header))
+    for label, key in (("parse (s)", 'parse'), ("statistics (s)", 'stats')):
+        legacy, fused = results['legacy'][key], results['fused'][key]
+        print(f"{label:>14} {legacy:>12.2f} {fused:>12.2f} {legacy / fused:>9.1f}x")
+
+    if results['legacy']['result'] != results['fused']['result']:
+        print("❌ Statistics differ from legacy implementation")
+
+
+def _parallel_report(log_file):
+    jobs = os.cpu_count() or 1
+    serial, serial_time = _timed(lambda: LogAnalyzer(log_file, keep_logs=False))
+    parallel, parallel_time = _timed(lambda: LogAnalyzer(log_file, keep_logs=False, jobs=jobs))
+
+    print(f"\n🧵 Parallel parse ({jobs} jobs)")
+    print(f"   serial: {serial_time:.2f}s  parallel: {parallel_time:.2f}s  "
+          f"speedup: {serial_time / parallel_time:.1f}x")
+    if serial.get_statistics() != parallel.get_statistics():
+        print("❌ Parallel statistics differ from serial parse")
+
+
+BENCH_MODES = ("store", "parse", "parallel")
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LINES
+    modes = sys.argv[2:] or BENCH_MODES
+    for mode in modes:
+        if mode not in BENCH_MODES:
+            print(f"Unknown mode: {mode} (choose from {', '.join(BENCH_MODES)})")
+            return
+
+    print("\n" + "="*60)
+    print("⏱️  Log Analyzer Benchmark")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as folder:
+        log_file = os.path.join(folder, "security.log")
+        first, last = generate_log(log_file, lines)
+        print(f"Lines: {lines:,}  Log size: {os.path.getsize(log_file) / (1024 * 1024):.1f} MB")
+
+        if "store" in modes:
+            _store_report(log_file, first, last)
+        if "parse" in modes:
+            _parse_report(log_file)
+        if "parallel" in modes:
+            _parallel_report(log_file)
+
+    print("\n✅ Benchmark complete\n")
+
+
+if __name__ == "__main__":
+    main()
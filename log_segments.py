@@ -0,0 +1,95 @@
+import io
+import os
+import gzip
+import json
+
+# zstandard opsional; tanpa library ini hanya gzip yang tersedia
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Kompresi segmen log yang sudah ditutup
+COMPRESSIONS = ("gzip", "zstd", "none")
+SEGMENT_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst", "none": ""}
+
+# Manifest segmen disimpan di samping file log aktif: security.log.manifest.json
+MANIFEST_SUFFIX = ".manifest.json"
+
+
+def validate_compression(compression):
+    """Pastikan kompresi dikenal dan library-nya tersedia"""
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown log compression: {compression} (choose from {', '.join(COMPRESSIONS)})")
+    if compression == "zstd" and zstandard is None:
+        raise ValueError("zstd log compression requires the 'zstandard' package")
+
+
+def manifest_path(log_file):
+    return f"{log_file}{MANIFEST_SUFFIX}"
+
+
+def load_manifest(log_file):
+    """Daftar segmen (terlama dulu); list kosong jika log belum pernah dirotasi"""
+    try:
+        with open(manifest_path(log_file), 'r') as f:
+            return json.load(f)['segments']
+    except FileNotFoundError:
+        return []
+
+
+def append_segment(log_file, segment, update=None):
+    """Tambahkan satu segmen ke manifest (ditulis atomik lewat file sementara).
+
+    update(segment), jika diberikan, dipanggil untuk tiap segmen lama sebelum manifest ditulis.
+    """
+    segments = load_manifest(log_file)
+    if update is not None:
+        for old in segments:
+            update(old)
+    segments.append(segment)
+    path = manifest_path(log_file)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        json.dump({'log_file': os.path.basename(log_file), 'segments': segments}, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def segment_path(log_file, segment):
+    """Path file segmen (relatif terhadap direktori file log)"""
+    return os.path.join(os.path.dirname(os.path.abspath(log_file)), segment['file'])
+
+
+def open_segment(path, compression):
+    """Buka segmen untuk dibaca sebagai stream byte yang sudah didekompresi"""
+    if compression == "gzip":
+        return gzip.open(path, 'rb')
+    if compression == "zstd":
+        validate_compression(compression)
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True))
+    return open(path, 'rb')
+
+
+def create_segment(path, compression):
+    """Buka file segmen baru untuk ditulis (data dikompresi saat ditulis)"""
+    if compression == "gzip":
+        return gzip.open(path, 'wb')
+    if compression == "zstd":
+        validate_compression(compression)
+        return zstandard.ZstdCompressor().stream_writer(open(path, 'wb'), closefd=True)
+    return open(path, 'wb')
+
+
+def segment_overlaps(segment, start, end):
+    """Apakah rentang waktu segmen (ISO string di manifest) beririsan dengan [start, end].
+
+    start/end berupa string ISO 'YYYY-MM-DDTHH:MM:SS' (atau None = tanpa batas) sehingga
+    bisa dibandingkan langsung. Segmen tanpa timestamp selalu dianggap beririsan.
+    """
+    if segment.get('start') is None or segment.get('end') is None:
+        return True
+    if end is not None and segment['start'] > end:
+        return False
+    if start is not None and segment['end'] < start:
+        return False
+    return True
@@ -0,0 +1,501 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import datetime, timedelta
+
+# NumPy opsional: jika tersedia, filter dan hitungan dijalankan secara vektor
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+EPOCH = datetime(1970, 1, 1)
+
+# Nilai timestamp untuk baris yang waktunya tidak bisa di-parse
+MISSING_TIMESTAMP = -(2 ** 63)
+
+# Tidak ada nama file di pesan log
+NO_FILE = -1
+
+# prefix_lengths untuk baris yang dibentuk ulang lewat parse_line: pesan tidak berada di
+# akhir baris (log JSON) atau prefix-nya tidak muat di kolom uint16
+STRUCTURED_ROW = 0xFFFF
+
+# Lebar bucket TimeIndex (detik); query per jam memakai 60 bucket menit
+BUCKET_SECONDS = 60
+
+# Lebar bucket TimeIndex setelah compact (detik): bucket menit lama digabung per jam
+COMPACT_BUCKET_SECONDS = 3600
+
+
+def to_epoch(timestamp):
+    """Ubah datetime (naive, waktu lokal log) menjadi detik integer"""
+    delta = timestamp - EPOCH
+    return delta.days * 86400 + delta.seconds
+
+
+def from_epoch(seconds):
+    """Kebalikan to_epoch"""
+    return EPOCH + timedelta(seconds=seconds)
+
+
+def extract_file_name(message):
+    """Ambil nama file dari pesan berformat 'File "<nama>" ...' (None jika tidak ada)"""
+    if message.startswith('File "'):
+        end = message.find('"', 6)
+        if end != -1:
+            return message[6:end]
+    return None
+
+
+class ColumnarLogStore:
+    """Penyimpanan log kolumnar berbasis array (pengganti list of dict yang hemat memori).
+
+    Kolom per baris: timestamp epoch (int64), kode level (uint8), id nama file yang
+    di-intern (int32), offset baris mentah di buffer bersama (uint64) dan panjang
+    prefix sebelum pesan (uint16). Teks baris disimpan sekali di satu bytearray.
+    Entry dict hanya dibuat saat dibutuhkan (iterasi atau hasil query). Baris JSON dan
+    baris dengan prefix >= 0xFFFF byte ditandai STRUCTURED_ROW dan dibentuk kembali
+    lewat parse_line.
+    """
+
+    def __init__(self, parse_line=None):
+        self.parse_line = parse_line
+        self.timestamps = array('q')
+        self.levels = array('B')
+        self.file_ids = array('i')
+        self.offsets = array('Q')
+        self.prefix_lengths = array('H')
+        self.buffer = bytearray()
+
+        self.level_names = []
+        self._level_codes = {}
+        self.file_names = []
+        self._file_ids = {}
+
+    def __len__(self):
+        return len(self.levels)
+
+    def _intern_level(self, level):
+        code = self._level_codes.get(level)
+        if code is None:
+            code = self._level_codes[level] = len(self.level_names)
+            self.level_names.append(level)
+        return code
+
+    def _intern_file(self, file_name):
+        file_id = self._file_ids.get(file_name)
+        if file_id is None:
+            file_id = self._file_ids[file_name] = len(self.file_names)
+            self.file_names.append(file_name)
+        return file_id
+
+    def append(self, entry):
+        """Tambahkan satu entry hasil parse_line"""
+        raw = entry['raw']
+        message = entry['message']
+        if 'event' in entry:
+            prefix_length = STRUCTURED_ROW
+        else:
+            prefix_length = min(len(raw[:len(raw) - len(message)].encode('utf-8')), STRUCTURED_ROW)
+
+        self.offsets.append(len(self.buffer))
+        self.prefix_lengths.append(prefix_length)
+        self.buffer += raw.encode('utf-8')
+
+        timestamp = entry['timestamp']
+        self.timestamps.append(to_epoch(timestamp) if timestamp else MISSING_TIMESTAMP)
+        self.levels.append(self._intern_level(entry['level']))
+
+        file_name = entry.get('file') or extract_file_name(message)
+        self.file_ids.append(self._intern_file(file_name) if file_name is not None else NO_FILE)
+
+    def entry(self, index):
+        """Bentuk kembali entry dict untuk baris ke-index"""
+        start = self.offsets[index]
+        end = self.offsets[index + 1] if index + 1 < len(self.offsets) else len(self.buffer)
+        raw = self.buffer[start:end].decode('utf-8')
+        if self.prefix_lengths[index] == STRUCTURED_ROW:
+            return self.parse_line(raw)
+        message = self.buffer[start + self.prefix_lengths[index]:end].decode('utf-8')
+        timestamp = self.timestamps[index]
+
+        return {
+            'timestamp': from_epoch(timestamp) if timestamp != MISSING_TIMESTAMP else None,
+            'level': self.level_names[self.levels[index]],
+            'message': message,
+            'raw': raw
+        }
+
+    def entries(self, indices):
+        """Generator entry dict untuk daftar index"""
+        for index in indices:
+            yield self.entry(int(index))
+
+    def __iter__(self):
+        return self.entries(range(len(self)))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self.entries(range(*index.indices(len(self)))))
+        if index < 0:
+            index += len(self)
+        return self.entry(index)
+
+    # ------------------------------------------------------------------
+    # Query: NumPy jika tersedia, loop array biasa jika tidak
+    # ------------------------------------------------------------------
+
+    def level_indices(self, level):
+        """Index baris dengan level tertentu"""
+        code = self._level_codes.get(level)
+        if code is None:
+            return []
+        if np is not None:
+            return np.flatnonzero(np.frombuffer(self.levels, dtype=np.uint8) == code)
+        # Kolom level 1 byte per baris, jadi bytes.find bisa dipakai sebagai scan di C
+        levels = self.levels.tobytes()
+        needle = bytes((code,))
+        indices = []
+        index = levels.find(needle)
+        while index != -1:
+            indices.append(index)
+            index = levels.find(needle, index + 1)
+        return indices
+
+    def time_range_indices(self, start_date, end_date):
+        """Index baris dengan start_date <= timestamp <= end_date"""
+        start, end = to_epoch(start_date), to_epoch(end_date)
+        if np is not None:
+            timestamps = np.frombuffer(self.timestamps, dtype=np.int64)
+            return np.flatnonzero((timestamps >= start) & (timestamps <= end))
+        return [index for index, value in enumerate(self.timestamps) if start <= value <= end]
+
+    def file_indices(self, file_name):
+        """Index baris yang menyebut file tertentu"""
+        file_id = self._file_ids.get(file_name)
+        if file_id is None:
+            return []
+        if np is not None:
+            return np.flatnonzero(np.frombuffer(self.file_ids, dtype=np.int32) == file_id)
+        return [index for index, value in enumerate(self.file_ids) if value == file_id]
+
+    def count_by_level(self):
+        """Jumlah baris per level"""
+        if np is not None and len(self):
+            counts = np.bincount(np.frombuffer(self.levels, dtype=np.uint8), minlength=len(self.level_names))
+            return {level: int(counts[code]) for code, level in enumerate(self.level_names) if counts[code]}
+        return {self.level_names[code]: count for code, count in Counter(self.levels).items()}
+
+    def memory_usage(self):
+        """Perkiraan memori (byte) yang dipakai kolom dan buffer"""
+        columns = (self.timestamps, self.levels, self.file_ids, self.offsets, self.prefix_lengths)
+        total = sum(column.itemsize * len(column) for column in columns)
+        return total + len(self.buffer) + sum(len(name) for name in self.file_names)
+
+
+class TimeIndex:
+    """Index waktu untuk log yang ditulis berurutan (query rentang O(log n)).
+
+    Selalu menyimpan bucket per menit: detik awal bucket, offset byte baris pertama
+    di file log, dan jumlah baris sebelum bucket. Tabel ini kecil sehingga bisa
+    disimpan ke state dan dipakai untuk seek langsung ke file tanpa membaca baris
+    sebelumnya. Jika per_line=True, epoch dan posisi entry tiap baris ikut disimpan
+    sehingga rentang dan jumlahnya didapat lewat bisect.
+
+    Baris tanpa timestamp tidak diindex. Jika timestamp pernah mundur, ordered
+    menjadi False dan pemanggil harus kembali ke scan linear.
+
+    compact() menggabungkan bucket menit lama menjadi bucket per jam (compacted
+    bucket pertama), sehingga tabel yang disimpan ke state tumbuh per jam, bukan
+    per menit. Seek ke bagian itu membaca paling banyak satu jam baris ekstra.
+    """
+
+    def __init__(self, per_line=True):
+        self.per_line = per_line
+        self.epochs = array('q')
+        self.positions = array('q')
+
+        self.bucket_starts = array('q')
+        self.bucket_offsets = array('Q')
+        self.bucket_totals = array('Q')
+        self.compacted = 0
+
+        self.count = 0
+        self.ordered = True
+        self.first_epoch = None
+        self.last_epoch = None
+
+    def add(self, epoch, offset, position=None):
+        """Index satu baris: epoch detik, offset awal baris di file, posisi entry di memori"""
+        if self.last_epoch is not None and epoch < self.last_epoch:
+            self.ordered = False
+        if not self.ordered:
+            return
+        if self.first_epoch is None:
+            self.first_epoch = epoch
+        self.last_epoch = epoch
+
+        bucket = epoch - epoch % BUCKET_SECONDS
+        if not self.bucket_starts or self.bucket_starts[-1] != bucket:
+            self.bucket_starts.append(bucket)
+            self.bucket_offsets.append(offset)
+            self.bucket_totals.append(self.count)
+
+        if self.per_line:
+            self.epochs.append(epoch)
+            self.positions.append(position)
+        self.count += 1
+
+    def extend(self, other):
+        """Sambungkan index bagian log sesudahnya (bucket saja, misalnya hasil parse paralel)"""
+        if not other.count and other.ordered:
+            return
+        if not other.ordered or (self.last_epoch is not None and other.first_epoch < self.last_epoch):
+            self.ordered = False
+        if not self.ordered:
+            return
+        if self.first_epoch is None:
+            self.first_epoch = other.first_epoch
+
+        for index, bucket in enumerate(other.bucket_starts):
+            if self.bucket_starts and self.bucket_starts[-1] == bucket:
+                continue
+            self.bucket_starts.append(bucket)
+            self.bucket_offsets.append(other.bucket_offsets[index])
+            self.bucket_totals.append(self.count + other.bucket_totals[index])
+        self.count += other.count
+        self.last_epoch = other.last_epoch
+
+    def compact(self, keep_from):
+        """Gabungkan bucket menit sebelum keep_from (epoch) menjadi bucket per jam (tanpa per_line)"""
+        if self.per_line or not self.ordered:
+            return
+        keep_from -= keep_from % COMPACT_BUCKET_SECONDS
+        stop = bisect_left(self.bucket_starts, keep_from, self.compacted)
+        if stop <= self.compacted:
+            return
+
+        starts = self.bucket_starts[:self.compacted]
+        offsets = self.bucket_offsets[:self.compacted]
+        totals = self.bucket_totals[:self.compacted]
+        for index in range(self.compacted, stop):
+            bucket = self.bucket_starts[index] - self.bucket_starts[index] % COMPACT_BUCKET_SECONDS
+            if starts and starts[-1] == bucket:
+                continue
+            starts.append(bucket)
+            offsets.append(self.bucket_offsets[index])
+            totals.append(self.bucket_totals[index])
+        self.compacted = len(starts)
+
+        self.bucket_starts = starts + self.bucket_starts[stop:]
+        self.bucket_offsets = offsets + self.bucket_offsets[stop:]
+        self.bucket_totals = totals + self.bucket_totals[stop:]
+
+    def _bucket_end(self, index):
+        """Epoch setelah akhir bucket index (bucket compact selebar satu jam)"""
+        width = COMPACT_BUCKET_SECONDS if index < self.compacted else BUCKET_SECONDS
+        return self.bucket_starts[index] + width
+
+    def line_range(self, start, end):
+        """Rentang [lo, hi) di epochs/positions untuk start <= epoch <= end (per_line saja)"""
+        return bisect_left(self.epochs, start), bisect_right(self.epochs, end)
+
+    def seek_offset(self, start):
+        """Offset file untuk mulai membaca baris dengan epoch >= start (None jika tidak ada)"""
+        index = bisect_right(self.bucket_starts, start) - 1
+        if index < 0:
+            index = 0
+        if index >= len(self.bucket_starts):
+            return None
+        return self.bucket_offsets[index]
+
+    def _bucket_total(self, index):
+        return self.bucket_totals[index] if index < len(self.bucket_totals) else self.count
+
+    def count_range(self, start, end, count_lines=None):
+        """Jumlah baris dengan start <= epoch <= end.
+
+        Dengan per_line cukup dua bisect. Tanpa per_line, bucket yang seluruhnya
+        berada di dalam rentang dijumlah dari bucket_totals, sedangkan bucket di tepi
+        dihitung dengan count_lines(offset, stop_offset, start, end) yang membaca file
+        dari offset sampai stop_offset (None = sampai akhir bagian yang diindex).
+        """
+        if start > end or not self.count:
+            return 0
+        if self.per_line:
+            lo, hi = self.line_range(start, end)
+            return hi - lo
+
+        starts = self.bucket_starts
+        first_full = bisect_left(starts, start)
+        end_full = bisect_right(starts, end - COMPACT_BUCKET_SECONDS + 1, first_full, self.compacted)
+        if end_full >= self.compacted:
+            end_full = bisect_right(starts, end - BUCKET_SECONDS + 1, max(first_full, self.compacted))
+        end_full = max(first_full, end_full)
+        total = self._bucket_total(end_full) - self._bucket_total(first_full)
+
+        partial = set()
+        if first_full > 0 and self._bucket_end(first_full - 1) > start:
+            partial.add(first_full - 1)
+        if end_full < len(starts) and starts[end_full] <= end:
+            partial.add(end_full)
+        for index in sorted(partial):
+            stop = self.bucket_offsets[index + 1] if index + 1 < len(starts) else None
+            total += count_lines(self.bucket_offsets[index], stop, start, end)
+        return total
+
+    def to_state(self):
+        """Serialisasi tabel bucket (index per baris tidak disimpan)"""
+        return {
+            'count': self.count,
+            'ordered': self.ordered,
+            'compacted': self.compacted,
+            'first_epoch': self.first_epoch,
+            'last_epoch': self.last_epoch,
+            'bucket_starts': self.bucket_starts.tolist(),
+            'bucket_offsets': self.bucket_offsets.tolist(),
+            'bucket_totals': self.bucket_totals.tolist()
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Bangun kembali index bucket dari hasil to_state (tanpa index per baris)"""
+        index = cls(per_line=False)
+        index.count = state['count']
+        index.ordered = state['ordered']
+        index.first_epoch = state.get('first_epoch')
+        index.last_epoch = state['last_epoch']
+        index.bucket_starts = array('q', state['bucket_starts'])
+        index.bucket_offsets = array('Q', state['bucket_offsets'])
+        index.bucket_totals = array('Q', state['bucket_totals'])
+        index.compacted = state.get('compacted', 0)
+        return index
+
+
+# Resolusi TimeSeries: (nama, lebar bucket dalam detik, jumlah bucket yang disimpan; None = semua)
+TIMESERIES_RESOLUTIONS = (
+    ('minute', 60, 24 * 60),
+    ('hour', 3600, 90 * 24),
+    ('day', 86400, None),
+)
+
+
+class TimeSeries:
+    """Counter bergulir per menit/jam/hari untuk tiap level dan jenis event.
+
+    Tiap resolusi berupa dict awal bucket (epoch) -> (Counter level, Counter event).
+    Baris log hanya menambah counter menit yang sedang berjalan; counter itu baru
+    digulung ke semua resolusi saat menit berganti (atau sebelum dibaca). Bucket di
+    luar retensi resolusinya (dihitung dari bucket terbaru) tidak dikembalikan dan
+    dibuang secara berkala, sehingga ukurannya tetap walaupun log terus bertambah.
+    Query sebuah rentang hanya menyentuh bucket di rentang tersebut, tidak pernah
+    baris log.
+    """
+
+    def __init__(self):
+        self.buckets = {name: {} for name, _, _ in TIMESERIES_RESOLUTIONS}
+        self.latest = {name: None for name, _, _ in TIMESERIES_RESOLUTIONS}
+        self._minute = None
+        self._levels = Counter()
+        self._events = Counter()
+
+    def _bucket(self, name, width, retention, epoch):
+        start = epoch - epoch % width
+        buckets = self.buckets[name]
+        counters = buckets.get(start)
+        if counters is None:
+            counters = buckets[start] = (Counter(), Counter())
+            if self.latest[name] is None or start > self.latest[name]:
+                self.latest[name] = start
+            if retention is not None and len(buckets) > retention + retention // 4:
+                cutoff = self._cutoff(name, width, retention)
+                for old in [old for old in buckets if old < cutoff]:
+                    del buckets[old]
+        return counters
+
+    def _cutoff(self, name, width, retention):
+        """Awal bucket tertua yang masih dalam retensi (None = tanpa batas)"""
+        if retention is None or self.latest[name] is None:
+            return None
+        return self.latest[name] - (retention - 1) * width
+
+    def _flush(self):
+        """Gulung counter menit yang sedang berjalan ke semua resolusi"""
+        if self._minute is not None:
+            for name, width, retention in TIMESERIES_RESOLUTIONS:
+                counters = self._bucket(name, width, retention, self._minute)
+                counters[0].update(self._levels)
+                counters[1].update(self._events)
+            self._minute = None
+            self._levels = Counter()
+            self._events = Counter()
+
+    def add(self, epoch, level, event=None):
+        """Hitung satu baris log pada detik epoch; event None hanya menambah counter level"""
+        minute = epoch - epoch % 60
+        if minute != self._minute:
+            self._flush()
+            self._minute = minute
+        self._levels[level] += 1
+        if event is not None:
+            self._events[event] += 1
+
+    def merge(self, other):
+        """Tambahkan seluruh counter dari TimeSeries lain"""
+        self._flush()
+        other._flush()
+        for name, width, retention in TIMESERIES_RESOLUTIONS:
+            for start, (levels, events) in other.buckets[name].items():
+                counters = self._bucket(name, width, retention, start)
+                counters[0].update(levels)
+                counters[1].update(events)
+
+    def query(self, resolution, start=None, end=None):
+        """Bucket tidak kosong dengan start <= awal bucket <= end (epoch, None = tanpa batas), urut waktu.
+
+        Hasil berupa list (awal bucket, Counter level, Counter event). Jumlah langkah
+        sebanding dengan jumlah bucket, bukan jumlah baris log.
+        """
+        self._flush()
+        width, retention = next((width, retention) for name, width, retention in TIMESERIES_RESOLUTIONS
+                                if name == resolution)
+        buckets = self.buckets[resolution]
+        if start is not None:
+            start -= start % width
+        cutoff = self._cutoff(resolution, width, retention)
+        if cutoff is not None and (start is None or start < cutoff):
+            start = cutoff
+        if start is None or end is None or (end - start) // width + 1 > len(buckets):
+            starts = sorted(bucket for bucket in buckets
+                            if (start is None or bucket >= start) and (end is None or bucket <= end))
+        else:
+            starts = [bucket for bucket in range(start, end + 1, width) if bucket in buckets]
+        return [(bucket, *buckets[bucket]) for bucket in starts]
+
+    def retained_from(self, resolution):
+        """Awal bucket tertua resolusi ini yang masih dalam retensi (None = tanpa batas)"""
+        self._flush()
+        for name, width, retention in TIMESERIES_RESOLUTIONS:
+            if name == resolution:
+                return self._cutoff(name, width, retention)
+        raise ValueError(f"Unknown resolution: {resolution}")
+
+    def to_state(self):
+        """Serialisasi counter"""
+        self._flush()
+        return {
+            name: {str(start): [dict(levels), dict(events)] for start, (levels, events) in buckets.items()}
+            for name, buckets in self.buckets.items()
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Kebalikan to_state"""
+        series = cls()
+        for name, width, retention in TIMESERIES_RESOLUTIONS:
+            for start, (levels, events) in state.get(name, {}).items():
+                counters = series._bucket(name, width, retention, int(start))
+                counters[0].update(levels)
+                counters[1].update(events)
+        return series
@@ -0,0 +1,284 @@
+import os
+import time
+import queue
+import atexit
+import threading
+from collections import deque
+from datetime import datetime
+
+from log_analyzer import parse_line, LogStatistics, RECENT_LOGS, entry_to_state
+from log_segments import validate_compression, append_segment, create_segment, SEGMENT_EXTENSIONS
+
+# Ukuran antrean baris log; jika penuh, pemanggil menunggu (backpressure)
+DEFAULT_QUEUE_SIZE = 10000
+
+# Jeda maksimum (detik) sebelum baris yang tertampung ditulis ke disk
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# Jumlah baris maksimum per satu kali write
+BATCH_SIZE = 1000
+
+_STOP = object()
+
+
+class AsyncLogWriter:
+    """Penulis log di background thread: file tetap terbuka, baris ditulis per batch.
+
+    Jika max_bytes atau max_age (detik) diberikan, file log dirotasi setelah batch
+    yang melewati batas: file aktif dipindah, file baru langsung dibuat, lalu segmen
+    lama dikompresi (gzip/zstd) dan dicatat di manifest beserta rentang waktu dan
+    statistiknya. Thread writer hanya memindah dan membuka ulang file; kompresi dan
+    ringkasan segmen berjalan berurutan di thread kompresor terpisah.
+    """
+
+    def __init__(self, path, queue_size=DEFAULT_QUEUE_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 max_bytes=None, max_age=None, compression="gzip"):
+        validate_compression(compression)
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compression = compression
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._file = None
+        self._inode = None
+        self._segment_started = None
+        self._closed = False
+        # File aktif yang sudah dipindah, menunggu dikompresi (dibuat saat rotasi pertama)
+        self._segments = queue.Queue()
+        self._compressor = None
+        self._thread = threading.Thread(target=self._run, name=f"log-writer:{path}", daemon=True)
+        self._thread.start()
+
+    def write(self, line, flush=False):
+        """Antrekan satu baris log; flush=True menunggu sampai baris sudah di disk"""
+        if self._closed:
+            return
+        self._queue.put(line)
+        if flush:
+            self.flush()
+
+    def flush(self, timeout=5.0):
+        """Tunggu sampai semua baris yang sudah diantrekan tertulis ke disk.
+
+        Kembalikan False (dan beri peringatan) jika belum selesai dalam timeout detik.
+        """
+        if self._closed:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            pass
+        else:
+            if done.wait(timeout):
+                return True
+        print(f"⚠️  Log writer did not flush {self.path} within {timeout:g}s")
+        return False
+
+    def close(self):
+        """Tulis sisa antrean, tutup file, dan hentikan thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        if self._compressor is not None:
+            self._segments.put(_STOP)
+            self._compressor.join()
+
+    def _open(self):
+        """Buka (ulang) file log; dibuka ulang jika file dihapus atau dirotasi"""
+        try:
+            current_inode = os.stat(self.path).st_ino
+        except OSError:
+            current_inode = None
+
+        if self._file is not None and current_inode == self._inode:
+            return self._file
+
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._inode = os.fstat(self._file.fileno()).st_ino
+        self._segment_started = self._first_timestamp()
+        return self._file
+
+    def _first_timestamp(self):
+        """Waktu baris pertama file log aktif (sekarang jika file masih kosong)"""
+        if self.max_age:
+            with open(self.path, 'r', encoding='utf-8', errors='replace') as f:
+                entry = parse_line(f.readline())
+            if entry and entry['timestamp']:
+                return entry['timestamp'].timestamp()
+        return time.time()
+
+    def _rotation_due(self):
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            return True
+        return bool(self.max_age) and time.time() - self._segment_started >= self.max_age
+
+    def _rotate(self):
+        """Pindahkan file aktif dan buat file baru; segmen lama diantrekan ke thread kompresor"""
+        self._file.close()
+        self._file = None
+
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        rotated = f"{self.path}.{stamp}"
+        suffix = 1
+        while os.path.exists(rotated) or os.path.exists(rotated + SEGMENT_EXTENSIONS[self.compression]):
+            rotated = f"{self.path}.{stamp}-{suffix}"
+            suffix += 1
+        os.rename(self.path, rotated)
+        self._open()
+
+        if self._compressor is None:
+            self._compressor = threading.Thread(target=self._run_compressor, name=f"log-compressor:{self.path}",
+                                                daemon=True)
+            self._compressor.start()
+        self._segments.put(rotated)
+
+    def _run_compressor(self):
+        while True:
+            rotated = self._segments.get()
+            if rotated is _STOP:
+                return
+            try:
+                self._compress_segment(rotated)
+            except Exception as e:
+                print(f"Error compressing log segment {rotated}: {str(e)}")
+
+    def _compress_segment(self, rotated):
+        """Kompresi segmen yang sudah dipindah, ringkas isinya, lalu catat di manifest"""
+        destination = rotated + SEGMENT_EXTENSIONS[self.compression]
+        stats = LogStatistics()
+        recent_logs = deque(maxlen=RECENT_LOGS)
+        first = last = None
+        timestamped = 0
+        size = 0
+        with open(rotated, 'rb') as src:
+            target = create_segment(destination, self.compression) if destination != rotated else None
+            try:
+                for raw_line in src:
+                    size += len(raw_line)
+                    if target is not None:
+                        target.write(raw_line)
+                    entry = parse_line(raw_line.decode('utf-8', errors='replace'))
+                    if entry:
+                        stats.add(entry)
+                        recent_logs.append(entry)
+                        if entry['timestamp']:
+                            timestamped += 1
+                            first = first or entry['timestamp']
+                            last = entry['timestamp']
+            finally:
+                if target is not None:
+                    target.close()
+        inode = os.stat(rotated).st_ino
+
+        # Seri per menit hanya disimpan selama retensinya (24 jam dari segmen terbaru),
+        # jadi manifest tetap kecil untuk log bertahun-tahun tanpa kehilangan data menit terakhir
+        minutes_from = stats.timeseries.retained_from("minute")
+
+        def expire_minutes(segment):
+            minutes = segment.get('stats', {}).get('timeseries', {}).get('minute')
+            if minutes and minutes_from is not None:
+                segment['stats']['timeseries']['minute'] = {
+                    start: counters for start, counters in minutes.items() if int(start) >= minutes_from
+                }
+
+        append_segment(self.path, {
+            'file': os.path.basename(destination),
+            'compression': self.compression,
+            'inode': inode,
+            'bytes': size,
+            'start': first.isoformat() if first else None,
+            'end': last.isoformat() if last else None,
+            'entries': stats.total_logs,
+            'timestamped': timestamped,
+            'stats': stats.to_state(),
+            'recent_logs': [entry_to_state(entry) for entry in recent_logs]
+        }, update=expire_minutes)
+        # File mentah baru dihapus setelah tercatat, agar LogAnalyzer selalu melihat salah satunya
+        if destination != rotated:
+            os.remove(rotated)
+
+    def _write_batch(self, lines):
+        try:
+            f = self._open()
+            f.write('\n'.join(lines) + '\n')
+            f.flush()
+            if (self.max_bytes or self.max_age) and self._rotation_due():
+                self._rotate()
+        except Exception as e:
+            print(f"Error writing to log file: {str(e)}")
+
+    def _run(self):
+        lines = []
+        last_write = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = None
+
+            # Kumpulkan item lain yang sudah menunggu tanpa memblok
+            items = [item] if item is not None else []
+            while len(items) < BATCH_SIZE:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            markers = []
+            stop = False
+            for entry in items:
+                if entry is _STOP:
+                    stop = True
+                elif isinstance(entry, threading.Event):
+                    markers.append(entry)
+                else:
+                    lines.append(entry)
+
+            due = item is None or time.monotonic() - last_write >= self.flush_interval
+            if lines and (markers or stop or due or len(lines) >= BATCH_SIZE):
+                self._write_batch(lines)
+                lines = []
+                last_write = time.monotonic()
+
+            for marker in markers:
+                marker.set()
+
+            if stop:
+                if lines:
+                    self._write_batch(lines)
+                if self._file is not None:
+                    self._file.close()
+                return
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_log_writer(path, **options):
+    """Ambil writer bersama untuk satu file log (satu thread per file per proses).
+
+    options (max_bytes, max_age, compression) hanya dipakai saat writer pertama dibuat.
+    """
+    key = os.path.abspath(path)
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None or writer._closed:
+            writer = _writers[key] = AsyncLogWriter(path, **options)
+        return writer
+
+
+@atexit.register
+def close_all_writers():
+    """Flush dan tutup semua writer saat proses berhenti"""
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
@@ -0,0 +1,248 @@
+import os
+import json
+import socket
+import threading
+import http.client
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn, UnixStreamServer
+
+from file_integrity_monitor import ScanProgress
+
+# Socket kontrol default, di direktori kerja yang sama dengan hash_db.json dan security.log
+DEFAULT_SOCKET = "monitor.sock"
+
+# Timeout (detik) untuk request singkat seperti status; check tidak dibatasi
+STATUS_TIMEOUT = 5
+
+
+class MonitorService:
+    """Monitor yang tetap hidup: hash database dan state scanner tetap hangat di memori.
+
+    Semua operasi yang menyentuh hash database dijalankan berurutan di bawah satu lock.
+    check bersifat single-flight: request yang datang saat scan berjalan menunggu dan
+    menerima hasil scan yang sama, bukan memulai scan kedua.
+    """
+
+    def __init__(self, monitor):
+        self.monitor = monitor
+        self.lock = threading.Lock()
+        self.started = datetime.now().isoformat()
+        self.checks = 0
+        self.last_result = None
+        self.progress = None
+        self._flight_lock = threading.Lock()
+        self._flight = None
+
+    def check(self):
+        """Jalankan (atau tunggu) integrity check, kembalikan dict hasil check_integrity + progress akhir"""
+        with self._flight_lock:
+            flight = self._flight
+            leader = flight is None
+            if leader:
+                flight = self._flight = {'done': threading.Event(), 'result': None, 'error': None}
+
+        if leader:
+            try:
+                with self.lock:
+                    self.progress = ScanProgress()
+                    result = self.monitor.check_integrity(self.progress)
+                    self.checks += 1
+                    self.last_result = {**result, 'finished': datetime.now().isoformat()}
+                    # Progress akhir ikut dikirim agar client tidak membaca progress scan berikutnya
+                    flight['result'] = {**result, 'progress': self.progress.to_dict()}
+            except Exception as e:
+                flight['error'] = str(e)
+            finally:
+                with self._flight_lock:
+                    self._flight = None
+                flight['done'].set()
+        else:
+            flight['done'].wait()
+
+        if flight['error']:
+            raise RuntimeError(flight['error'])
+        return flight['result']
+
+    def check_paths(self, paths):
+        with self.lock:
+            return self.monitor.check_paths(paths)
+
+    def initialize_baseline(self):
+        with self.lock:
+            return {'files': self.monitor.initialize_baseline()}
+
+    def reload(self):
+        """Muat ulang hash database dari disk (setelah diubah proses lain, misalnya migrate)"""
+        with self.lock:
+            return {'files': self.monitor.reload_hash_db()}
+
+    def status(self):
+        progress = self.progress
+        return {
+            'pid': os.getpid(),
+            'started': self.started,
+            'watch_folder': str(self.monitor.watch_folder.absolute()),
+            'files': len(self.monitor.hash_db),
+            'settings': {
+                'verify_mode': self.monitor.verify_mode,
+                'workers': self.monitor.workers,
+                'executor': self.monitor.executor,
+                'algorithm': self.monitor.algorithm,
+                'precheck': self.monitor.precheck,
+                'hash_db': os.path.abspath(self.monitor.hash_db_file),
+                'storage': self.monitor.store.backend,
+                'symlink_policy': self.monitor.symlink_policy,
+                'log_format': self.monitor.log_format
+            },
+            'checks': self.checks,
+            'running': self._flight is not None,
+            'progress': progress.to_dict() if progress is not None else None,
+            'last_result': self.last_result
+        }
+
+    def serve(self, socket_path=DEFAULT_SOCKET):
+        """Layani API kontrol (HTTP di atas Unix socket) sampai Ctrl+C atau POST /shutdown"""
+        if os.path.exists(socket_path):
+            if MonitorClient(socket_path).available():
+                raise RuntimeError(f"Monitor service already running on {socket_path}")
+            # Socket basi dari proses yang sudah mati
+            os.remove(socket_path)
+
+        server = _ServiceServer(socket_path, _ServiceHandler)
+        server.service = self
+        os.chmod(socket_path, 0o600)
+        self.monitor._log("INFO", f"Monitor service listening on {socket_path}")
+        print(f"\n🛰️  Monitor service listening on {socket_path} (pid {os.getpid()})")
+        print(f"📁 Watching folder: {self.monitor.watch_folder.absolute()}")
+        print("\nPress Ctrl+C to stop...\n")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            self.monitor._log("INFO", "Monitor service stopped")
+            self.monitor.log_writer.flush()
+            print("\n✅ Monitor service stopped")
+
+
+class _ServiceServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    """Route API kontrol: (method, path) -> fungsi(service, payload)"""
+
+    ROUTES = {
+        ('GET', '/status'): lambda service, payload: service.status(),
+        ('POST', '/check'): lambda service, payload: service.check(),
+        ('POST', '/check-paths'): lambda service, payload: service.check_paths(payload.get('paths', [])),
+        ('POST', '/init'): lambda service, payload: service.initialize_baseline(),
+        ('POST', '/reload'): lambda service, payload: service.reload(),
+    }
+
+    def _send(self, status, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, method):
+        if method == 'POST' and self.path == '/shutdown':
+            self._send(200, {'stopping': True})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+
+        route = self.ROUTES.get((method, self.path))
+        if route is None:
+            self._send(404, {'error': f"Unknown endpoint: {method} {self.path}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            payload = json.loads(self.rfile.read(length)) if length else {}
+            self._send(200, route(self.server.service, payload))
+        except Exception as e:
+            self._send(500, {'error': str(e)})
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def address_string(self):
+        # Alamat client Unix socket berupa string kosong
+        return "local"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout=None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class MonitorClient:
+    """Client API kontrol MonitorService.
+
+    OSError (misalnya FileNotFoundError/ConnectionRefusedError) berarti service tidak
+    berjalan, sehingga pemanggil bisa kembali ke FileIntegrityMonitor di prosesnya
+    sendiri. Error dari service dilaporkan sebagai RuntimeError.
+    """
+
+    def __init__(self, socket_path=DEFAULT_SOCKET):
+        self.socket_path = socket_path
+
+    def request(self, method, path, payload=None, timeout=None):
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix sockets are not supported on this platform")
+        connection = _UnixHTTPConnection(self.socket_path, timeout)
+        try:
+            body = json.dumps(payload).encode('utf-8') if payload is not None else None
+            headers = {'Content-Type': 'application/json'} if body is not None else {}
+            connection.request(method, path, body, headers)
+            response = connection.getresponse()
+            data = json.loads(response.read() or b'null')
+        finally:
+            connection.close()
+        if response.status >= 400:
+            raise RuntimeError(data.get('error') if isinstance(data, dict) else f"HTTP {response.status}")
+        return data
+
+    def available(self):
+        """True jika service menjawab di socket_path"""
+        try:
+            self.status()
+            return True
+        except (OSError, RuntimeError, ValueError):
+            return False
+
+    def status(self):
+        return self.request('GET', '/status', timeout=STATUS_TIMEOUT)
+
+    def check(self):
+        return self.request('POST', '/check')
+
+    def check_paths(self, paths):
+        return self.request('POST', '/check-paths', {'paths': list(paths)})
+
+    def initialize_baseline(self):
+        return self.request('POST', '/init')['files']
+
+    def reload(self):
+        return self.request('POST', '/reload', timeout=STATUS_TIMEOUT)
+
+    def shutdown(self):
+        return self.request('POST', '/shutdown', timeout=STATUS_TIMEOUT)
@@ -1,11 +1,347 @@
-from flask import Flask, render_template, jsonify
+from flask import Flask, render_template, jsonify, Response, request
 from log_analyzer import LogAnalyzer
-from file_integrity_monitor import FileIntegrityMonitor
+from log_segments import manifest_path
+from file_integrity_monitor import FileIntegrityMonitor, ScanProgress
+from inotify_watcher import InotifyWatcher
+from monitor_service import MonitorClient, DEFAULT_SOCKET
 import os
-from datetime import datetime
+import json
+import time
+import uuid
+import threading
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 
 app = Flask(__name__)
 
+LOG_FILE = "security.log"
+
+# Index riwayat per file (SQLite), diperbarui setiap kali log dianalisis
+HISTORY_FILE = "security_history.db"
+
+# State analyzer dashboard (offset, statistik, time series) agar restart tidak parse ulang log
+STATE_FILE = "security_dashboard_state.json"
+
+# Monitor service (python file_integrity_monitor.py serve); jika tidak berjalan, check dijalankan di sini
+monitor_client = MonitorClient(DEFAULT_SOCKET)
+
+# Rentang default /api/timeseries per resolusi
+TIMESERIES_WINDOWS = {'minute': timedelta(hours=1), 'hour': timedelta(days=1), 'day': timedelta(days=30)}
+
+
+class AnalyzerCache:
+    """Satu LogAnalyzer untuk seluruh proses, dipakai bersama oleh semua request.
+    
+    Sebelum dipakai, signature log (inode, ukuran, mtime file aktif dan mtime manifest
+    segmen) dibandingkan dengan snapshot terakhir. Jika sama, snapshot (statistik dan
+    recent logs yang sudah diformat) langsung dikembalikan tanpa membaca log; jika
+    berbeda, analyzer hanya membaca baris baru lewat refresh. Refresh dan akses ke
+    analyzer dijaga lock sehingga aman untuk Flask multi-thread.
+    """
+    
+    def __init__(self, log_file, history_file=None, state_file=None):
+        self.log_file = log_file
+        self.history_file = history_file
+        self.state_file = state_file
+        self.lock = threading.Lock()
+        self._analyzer = None
+        self._snapshot = None
+    
+    def _signature(self):
+        signature = []
+        for path in (self.log_file, manifest_path(self.log_file)):
+            try:
+                file_stat = os.stat(path)
+                signature += [file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns]
+            except FileNotFoundError:
+                signature += [0, 0, 0]
+        return tuple(signature)
+    
+    def _build_snapshot(self, signature):
+        analyzer = self._analyzer
+        stats = analyzer.get_statistics()
+        if stats and stats['last_anomaly']:
+            stats['last_anomaly'] = stats['last_anomaly'].isoformat()
+        
+        recent_logs = [{
+            'timestamp': log['timestamp'].isoformat() if log['timestamp'] else None,
+            'level': log['level'],
+            'message': log['message']
+        } for log in reversed(analyzer.recent_logs)]
+        
+        return {
+            'signature': signature,
+            'offset': analyzer.offset,
+            'etag': '-'.join(f"{value:x}" for value in signature),
+            'stats': stats,
+            'recent_logs': recent_logs
+        }
+    
+    def analyzer(self):
+        """Analyzer yang sudah di-refresh; panggil sambil memegang self.lock"""
+        if self._analyzer is None:
+            self._analyzer = LogAnalyzer(self.log_file, state_file=self.state_file, keep_logs=False,
+                                         history_file=self.history_file)
+        else:
+            self._analyzer.refresh()
+        return self._analyzer
+    
+    def snapshot(self):
+        """Snapshot data terbaru: dict signature, offset, etag, stats (bisa None), recent_logs (terbaru dulu)"""
+        signature = self._signature()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot['signature'] == signature:
+            return snapshot
+        
+        with self.lock:
+            # Thread lain mungkin sudah me-refresh selama menunggu lock
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot['signature'] == signature:
+                return snapshot
+            # Signature diambil sebelum refresh: jika log bertambah di antaranya,
+            # request berikutnya melihat signature berbeda dan me-refresh lagi
+            self.analyzer()
+            snapshot = self._snapshot = self._build_snapshot(signature)
+        return snapshot
+
+
+analyzer_cache = AnalyzerCache(LOG_FILE, HISTORY_FILE, STATE_FILE)
+
+
+class LogEventBroadcaster:
+    """Satu thread yang mengikuti security.log dan membagikan baris baru ke semua client SSE.
+    
+    Thread menunggu perubahan di direktori log lewat inotify (polling tiap poll_interval
+    detik jika tidak tersedia), lalu membaca baris baru lewat analyzer bersama. Tiap
+    batch menjadi satu event 'logs' berisi entry baru (paling banyak batch_logs terakhir)
+    dan statistik terbaru; id event adalah offset global setelah baris terakhir sehingga
+    client bisa melanjutkan lewat Last-Event-ID. Client yang idle hanya menunggu
+    Condition sampai ada batch baru atau keepalive.
+    """
+    
+    def __init__(self, cache, poll_interval=0.5, rescan_interval=5.0, keepalive=15.0,
+                 batch_logs=100, backlog=50):
+        self.cache = cache
+        self.poll_interval = poll_interval
+        self.rescan_interval = rescan_interval
+        self.keepalive = keepalive
+        self.batch_logs = batch_logs
+        self.condition = threading.Condition()
+        # (nomor urut, offset, pesan SSE) untuk replay saat client reconnect
+        self.batches = deque(maxlen=backlog)
+        self.sequence = 0
+        self._thread = None
+        self._start_lock = threading.Lock()
+    
+    def start(self):
+        """Jalankan thread tail (sekali saja), mulai dari akhir log saat ini"""
+        with self._start_lock:
+            if self._thread is None:
+                offset = self.cache.snapshot()['offset']
+                self._thread = threading.Thread(target=self._run, args=(offset,), name="log-events",
+                                                daemon=True)
+                self._thread.start()
+    
+    def _wait(self, watcher):
+        if watcher is None:
+            time.sleep(self.poll_interval)
+        else:
+            # Timeout sebagai jaring pengaman untuk event yang terlewat
+            watcher.read_events(self.rescan_interval)
+    
+    def _run(self, offset):
+        try:
+            watcher = InotifyWatcher(os.path.dirname(os.path.abspath(self.cache.log_file)), recursive=False)
+        except OSError:
+            watcher = None
+        
+        signature = None
+        while True:
+            self._wait(watcher)
+            snapshot = self.cache.snapshot()
+            if snapshot['signature'] == signature:
+                continue
+            signature = snapshot['signature']
+            end = snapshot['offset']
+            if end < offset:
+                # Log dipotong atau diganti: kirim statistik baru, lanjut dari posisi baru tanpa replay
+                offset = end
+            elif end == offset:
+                continue
+            
+            with self.cache.lock:
+                logs = self.cache.analyzer().iter_logs_from(offset)
+            entries = deque(maxlen=self.batch_logs)
+            total = 0
+            for line_offset, line_end, log in logs:
+                if line_end > end:
+                    break
+                total += 1
+                entries.append({
+                    'offset': line_offset,
+                    'timestamp': log['timestamp'].isoformat() if log['timestamp'] else None,
+                    'level': log['level'],
+                    'message': log['message']
+                })
+            offset = end
+            self._publish(end, {
+                'logs': list(entries),
+                'skipped': total - len(entries),
+                'stats': snapshot['stats']
+            })
+    
+    def _publish(self, offset, payload):
+        with self.condition:
+            self.sequence += 1
+            message = f"id: {offset}\nevent: logs\ndata: {json.dumps(payload)}\n\n"
+            self.batches.append((self.sequence, offset, message))
+            self.condition.notify_all()
+    
+    def stream(self, last_event_id=None):
+        """Generator pesan SSE untuk satu client; replay batch setelah last_event_id jika masih ada"""
+        with self.condition:
+            sequence = self.sequence
+            if last_event_id is not None:
+                missed = [batch for batch in self.batches if batch[1] > last_event_id]
+                if missed:
+                    sequence = missed[0][0] - 1
+        
+        yield "retry: 2000\n\n"
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.sequence > sequence, timeout=self.keepalive)
+                pending = [batch for batch in self.batches if batch[0] > sequence]
+            if not pending:
+                yield ": keepalive\n\n"
+                continue
+            for batch_sequence, _, message in pending:
+                yield message
+            sequence = pending[-1][0]
+
+
+log_events = LogEventBroadcaster(analyzer_cache)
+
+
+class CheckJobs:
+    """Integrity check sebagai job background dengan single-flight.
+    
+    Job dijalankan oleh satu worker thread sehingga dua scan tidak pernah berjalan
+    bersamaan pada hash database yang sama. Selama masih ada job yang antre atau
+    berjalan, permintaan baru digabung ke job tersebut. Hanya max_jobs job terakhir
+    yang disimpan untuk endpoint status.
+    
+    Jika monitor service berjalan, scan didelegasikan ke service (hash database sudah
+    hangat di memori) dan progress dibaca dari status service; selain itu
+    FileIntegrityMonitor baru dibuat di proses ini.
+    """
+    
+    def __init__(self, max_jobs=20):
+        self.max_jobs = max_jobs
+        self.lock = threading.Lock()
+        self.jobs = OrderedDict()
+        self._current = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="integrity-check")
+    
+    def submit(self):
+        """Mulai job baru atau gabung ke job yang sedang berjalan: (job, coalesced)"""
+        with self.lock:
+            job = self._current
+            if job is not None and job['status'] in ('queued', 'running'):
+                return job, True
+            
+            job = {
+                'id': uuid.uuid4().hex,
+                'status': 'queued',
+                'submitted': datetime.now().isoformat(),
+                'started': None,
+                'finished': None,
+                'progress': ScanProgress(),
+                'result': None,
+                'error': None,
+                'service': None,
+                'service_progress': None
+            }
+            self.jobs[job['id']] = job
+            while len(self.jobs) > self.max_jobs:
+                self.jobs.popitem(last=False)
+            self._current = job
+            self._executor.submit(self._run, job)
+            return job, False
+    
+    def _run(self, job):
+        job['progress'] = ScanProgress()
+        job['started'] = datetime.now().isoformat()
+        job['status'] = 'running'
+        try:
+            try:
+                job['service'] = True
+                result = monitor_client.check()
+                # Progress akhir scan di service; status service bisa sudah milik scan berikutnya
+                job['service_progress'] = result.pop('progress', None)
+                job['result'] = result
+            except OSError:
+                job['service'] = False
+                monitor = FileIntegrityMonitor()
+                job['result'] = monitor.check_integrity(job['progress'])
+            job['status'] = 'done'
+        except Exception as e:
+            job['error'] = str(e)
+            job['status'] = 'failed'
+        finally:
+            job['finished'] = datetime.now().isoformat()
+    
+    def get(self, job_id):
+        """Status job dalam bentuk JSON (None jika id tidak dikenal)"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        
+        progress = job['progress'].to_dict()
+        if job['service'] and job['status'] == 'running':
+            try:
+                progress = monitor_client.status()['progress'] or progress
+            except (OSError, RuntimeError):
+                pass
+        elif job['service_progress']:
+            progress = job['service_progress']
+        status = {key: value for key, value in job.items() if key != 'service_progress'}
+        return {**status, 'progress': progress}
+    
+    def latest(self):
+        """Status job yang sedang berjalan atau terakhir (None jika belum pernah ada)"""
+        with self.lock:
+            job = self._current
+        return self.get(job['id']) if job is not None else None
+
+
+check_jobs = CheckJobs()
+
+# Ukuran halaman /api/logs (mode JSON); mode NDJSON tidak dibatasi kecuali ?limit=N
+LOGS_PAGE_SIZE = 100
+LOGS_MAX_PAGE_SIZE = 1000
+
+
+def _parse_date(value):
+    """Parse tanggal ISO dari query string menjadi datetime naive waktu lokal (seperti timestamp log).
+    
+    Nilai dengan zona waktu (misalnya ...Z atau +07:00) dikonversi ke waktu lokal; ValueError jika tidak valid.
+    """
+    date = datetime.fromisoformat(value)
+    if date.tzinfo is not None:
+        date = date.astimezone().replace(tzinfo=None)
+    return date
+
+
+def _not_modified(etag):
+    """Response 304 jika If-None-Match cocok dengan etag (None jika tidak)"""
+    if etag in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    return None
+
 # Template HTML (simpan sebagai templates/index.html)
 HTML_TEMPLATE = '''
 <!DOCTYPE html>
@@ -237,11 +573,11 @@ HTML_TEMPLATE = '''
         <div class="log-section">
             <h2>📋 Recent Activity</h2>
             {% if stats.last_anomaly %}
-            <p style="color: #f44336; margin-bottom: 15px;">
+            <p id="anomaly-status" style="color: #f44336; margin-bottom: 15px;">
                 <strong>⏰ Last Anomaly:</strong> {{ stats.last_anomaly }}
             </p>
             {% else %}
-            <p style="color: #4caf50; margin-bottom: 15px;">
+            <p id="anomaly-status" style="color: #4caf50; margin-bottom: 15px;">
                 <strong>✅ Status:</strong> No anomalies detected
             </p>
             {% endif %}
@@ -266,7 +602,7 @@ HTML_TEMPLATE = '''
             <div class="last-update">
                 Last updated: <span id="last-update">{{ now }}</span>
             </div>
-            <p>Dashboard auto-refreshes every 30 seconds</p>
+            <p>Dashboard updates live as new events are logged</p>
         </div>
     </div>
     
@@ -275,24 +611,84 @@ HTML_TEMPLATE = '''
             location.reload();
         }
         
+        function waitForCheck(jobId) {
+            return fetch('/api/check/' + jobId)
+                .then(response => response.json())
+                .then(job => {
+                    if (job.status === 'queued' || job.status === 'running') {
+                        return new Promise(resolve => setTimeout(resolve, 1000))
+                            .then(() => waitForCheck(jobId));
+                    }
+                    if (job.status === 'failed') {
+                        throw job.error;
+                    }
+                    return job.result;
+                });
+        }
+        
         function runCheck() {
-            fetch('/api/check')
+            fetch('/api/check', {method: 'POST'})
                 .then(response => response.json())
+                .then(job => waitForCheck(job.id))
                 .then(data => {
                     alert('Integrity check completed!\\n\\nResults:\\n' +
                           'Safe: ' + data.safe + '\\n' +
                           'Corrupted: ' + data.corrupted + '\\n' +
                           'New: ' + data.new + '\\n' +
                           'Deleted: ' + data.deleted);
-                    setTimeout(refreshData, 1000);
                 })
                 .catch(error => {
                     alert('Error running check: ' + error);
                 });
         }
         
-        // Auto refresh every 30 seconds
-        setInterval(refreshData, 30000);
+        function renderLog(log) {
+            const entry = document.createElement('div');
+            entry.className = 'log-entry ' + log.level;
+            const timestamp = document.createElement('div');
+            timestamp.className = 'timestamp';
+            timestamp.textContent = log.timestamp ? log.timestamp.replace('T', ' ') : 'N/A';
+            const level = document.createElement('span');
+            level.className = 'level ' + log.level;
+            level.textContent = log.level;
+            const message = document.createElement('span');
+            message.className = 'message';
+            message.textContent = log.message;
+            entry.append(timestamp, level, message);
+            return entry;
+        }
+        
+        function updateStats(stats) {
+            document.getElementById('safe-files').textContent = stats.safe_files;
+            document.getElementById('failed-files').textContent = stats.failed_files;
+            document.getElementById('anomalies').textContent = stats.anomaly_count;
+            document.getElementById('total-logs').textContent = stats.total_logs;
+            if (stats.last_anomaly) {
+                const status = document.getElementById('anomaly-status');
+                status.style.color = '#f44336';
+                status.innerHTML = '<strong>⏰ Last Anomaly:</strong> ';
+                status.append(stats.last_anomaly.replace('T', ' '));
+            }
+        }
+        
+        // Update langsung lewat Server-Sent Events; reload penuh hanya jika tidak didukung
+        if (window.EventSource) {
+            const events = new EventSource('/api/events');
+            events.addEventListener('logs', event => {
+                const batch = JSON.parse(event.data);
+                const container = document.getElementById('log-entries');
+                batch.logs.forEach(log => container.insertBefore(renderLog(log), container.firstChild));
+                while (container.children.length > 10) {
+                    container.removeChild(container.lastChild);
+                }
+                if (batch.stats) {
+                    updateStats(batch.stats);
+                }
+                document.getElementById('last-update').textContent = new Date().toLocaleString();
+            });
+        } else {
+            setInterval(refreshData, 30000);
+        }
     </script>
 </body>
 </html>
@@ -301,9 +697,12 @@ HTML_TEMPLATE = '''
 @app.route('/')
 def index():
     """Halaman utama dashboard"""
-    analyzer = LogAnalyzer()
-    stats = analyzer.get_statistics()
+    snapshot = analyzer_cache.snapshot()
+    not_modified = _not_modified(snapshot['etag'])
+    if not_modified:
+        return not_modified
     
+    stats = dict(snapshot['stats']) if snapshot['stats'] else None
     if not stats:
         stats = {
             'total_logs': 0,
@@ -316,56 +715,197 @@ def index():
         }
     
     # Ambil 10 log terakhir
-    recent_logs = []
-    for log in analyzer.logs[-10:]:
-        recent_logs.append({
-            'timestamp': log['timestamp'].strftime('%Y-%m-%d %H:%M:%S') if log['timestamp'] else 'N/A',
-            'level': log['level'],
-            'message': log['message']
-        })
-    recent_logs.reverse()
+    recent_logs = [{
+        **log,
+        'timestamp': log['timestamp'].replace('T', ' ') if log['timestamp'] else 'N/A'
+    } for log in snapshot['recent_logs']]
     
     # Format last anomaly
     if stats['last_anomaly']:
-        stats['last_anomaly'] = stats['last_anomaly'].strftime('%Y-%m-%d %H:%M:%S')
+        stats['last_anomaly'] = stats['last_anomaly'].replace('T', ' ')
     
-    return render_template('index.html', 
-                         stats=stats, 
-                         recent_logs=recent_logs,
-                         now=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    response = app.make_response(render_template('index.html', 
+                                                 stats=stats, 
+                                                 recent_logs=recent_logs,
+                                                 now=datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+    response.set_etag(snapshot['etag'])
+    return response
 
 @app.route('/api/stats')
 def api_stats():
     """API endpoint untuk mendapatkan statistik"""
-    analyzer = LogAnalyzer()
-    stats = analyzer.get_statistics()
-    
-    if stats and stats['last_anomaly']:
-        stats['last_anomaly'] = stats['last_anomaly'].isoformat()
+    snapshot = analyzer_cache.snapshot()
+    not_modified = _not_modified(snapshot['etag'])
+    if not_modified:
+        return not_modified
     
-    return jsonify(stats if stats else {})
+    response = jsonify(snapshot['stats'] if snapshot['stats'] else {})
+    response.set_etag(snapshot['etag'])
+    return response
 
-@app.route('/api/check')
+@app.route('/api/check', methods=['GET', 'POST'])
 def api_check():
-    """API endpoint untuk menjalankan integrity check"""
-    monitor = FileIntegrityMonitor()
-    results = monitor.check_integrity()
-    return jsonify(results)
+    """API endpoint integrity check di background.
+    
+    POST memulai check (202 + id job); jika sebuah check masih berjalan, request digabung
+    ke job tersebut (coalesced=true). GET tidak memulai scan (aman untuk prefetch/crawler),
+    hanya mengembalikan job yang sedang berjalan atau terakhir.
+    """
+    if request.method == 'GET':
+        job = check_jobs.latest()
+        if job is None:
+            return jsonify({'error': "No integrity check has been run yet"}), 404
+        return jsonify(job)
+    
+    job, coalesced = check_jobs.submit()
+    response = jsonify({**check_jobs.get(job['id']), 'coalesced': coalesced})
+    response.status_code = 202
+    response.headers['Location'] = f"/api/check/{job['id']}"
+    return response
+
+@app.route('/api/check/<job_id>')
+def api_check_status(job_id):
+    """API endpoint status job: progress (file, byte, ETA) dan hasil setelah selesai"""
+    job = check_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': f"Unknown job: {job_id}"}), 404
+    return jsonify(job)
+
+@app.route('/api/events')
+def api_events():
+    """Server-Sent Events: event 'logs' tiap ada baris baru di security.log (entry + statistik)"""
+    log_events.start()
+    last_event_id = request.headers.get('Last-Event-ID', '')
+    return Response(log_events.stream(int(last_event_id) if last_event_id.isdigit() else None),
+                    mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/api/logs')
 def api_logs():
-    """API endpoint untuk mendapatkan semua log"""
-    analyzer = LogAnalyzer()
+    """API endpoint log dengan cursor dan filter, tanpa memuat seluruh log.
+    
+    Parameter: cursor (offset dari next_cursor, atau timestamp ISO untuk mulai dari waktu
+    tersebut), limit, level, start/end (ISO), path (prefix nama file). Default berupa satu
+    halaman JSON {logs, next_cursor, has_more}; ?format=ndjson (atau Accept:
+    application/x-ndjson) men-stream semua entry yang cocok, satu objek per baris.
+    """
+    ndjson = request.args.get('format') == 'ndjson' or \
+        request.accept_mimetypes.best == 'application/x-ndjson'
+    try:
+        offset = 0
+        start_date = _parse_date(request.args['start']) if 'start' in request.args else None
+        end_date = _parse_date(request.args['end']) if 'end' in request.args else None
+        cursor = request.args.get('cursor')
+        if cursor and cursor.isdigit():
+            offset = int(cursor)
+        elif cursor:
+            cursor_date = _parse_date(cursor)
+            start_date = max(start_date, cursor_date) if start_date else cursor_date
+        limit = int(request.args['limit']) if 'limit' in request.args else (None if ndjson else LOGS_PAGE_SIZE)
+        if limit is not None and limit < 1:
+            raise ValueError(f"limit must be at least 1, got {limit}")
+        if not ndjson:
+            limit = min(limit, LOGS_MAX_PAGE_SIZE)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if not os.path.exists(LOG_FILE):
+        return Response('', mimetype='application/x-ndjson') if ndjson else \
+            jsonify({'logs': [], 'next_cursor': offset, 'has_more': False})
+    
+    with analyzer_cache.lock:
+        logs = analyzer_cache.analyzer().iter_logs_from(offset, request.args.get('level'), start_date,
+                                                        end_date, request.args.get('path'))
     
-    logs_data = []
-    for log in analyzer.logs:
-        logs_data.append({
+    def item(line_offset, log):
+        result = {
+            'offset': line_offset,
             'timestamp': log['timestamp'].isoformat() if log['timestamp'] else None,
             'level': log['level'],
             'message': log['message']
-        })
+        }
+        if log.get('event'):
+            result['event'] = log['event']
+        return result
+    
+    if ndjson:
+        def generate():
+            for count, (line_offset, line_end, log) in enumerate(logs, 1):
+                yield json.dumps({**item(line_offset, log), 'cursor': line_end}) + '\n'
+                if count == limit:
+                    break
+        return Response(generate(), mimetype='application/x-ndjson')
+    
+    page = []
+    next_cursor = offset
+    has_more = False
+    for line_offset, line_end, log in logs:
+        if len(page) == limit:
+            has_more = True
+            break
+        page.append(item(line_offset, log))
+        next_cursor = line_end
+    return jsonify({'logs': page, 'next_cursor': next_cursor, 'has_more': has_more})
+
+@app.route('/api/timeseries')
+def api_timeseries():
+    """API endpoint jumlah log per bucket (?resolution=minute|hour|day, ?start=...&end=... ISO).
+    
+    Tanpa start, rentang default mengikuti resolusi (1 jam, 1 hari, 30 hari sampai end/sekarang).
+    """
+    resolution = request.args.get('resolution', 'hour')
+    try:
+        if resolution not in TIMESERIES_WINDOWS:
+            raise ValueError(f"Unknown resolution: {resolution} (choose from {', '.join(TIMESERIES_WINDOWS)})")
+        end_date = _parse_date(request.args['end']) if 'end' in request.args else datetime.now()
+        start_date = _parse_date(request.args['start']) if 'start' in request.args else \
+            end_date - TIMESERIES_WINDOWS[resolution]
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    with analyzer_cache.lock:
+        buckets = analyzer_cache.analyzer().get_timeseries(resolution, start_date, end_date)
+    
+    totals = {'levels': Counter(), 'events': Counter()}
+    for bucket in buckets:
+        totals['levels'].update(bucket['levels'])
+        totals['events'].update(bucket['events'])
+        bucket['start'] = bucket['start'].isoformat()
+    
+    return jsonify({
+        'resolution': resolution,
+        'start': start_date.isoformat(),
+        'end': end_date.isoformat(),
+        'buckets': buckets,
+        'totals': {key: dict(counts) for key, counts in totals.items()}
+    })
+
+@app.route('/api/files/<path:file_name>/history')
+def api_file_history(file_name):
+    """API endpoint riwayat event satu file (?days=N atau ?start=...&end=... ISO, ?limit=N)"""
+    try:
+        end_date = _parse_date(request.args['end']) if 'end' in request.args else None
+        start_date = _parse_date(request.args['start']) if 'start' in request.args else None
+        if 'days' in request.args:
+            start_date = (end_date or datetime.now()) - timedelta(days=float(request.args['days']))
+        limit = int(request.args['limit']) if 'limit' in request.args else None
+        if limit is not None and limit < 1:
+            raise ValueError(f"limit must be at least 1, got {limit}")
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if not os.path.exists(LOG_FILE):
+        return jsonify([])
     
-    return jsonify(logs_data)
+    with analyzer_cache.lock:
+        history = analyzer_cache.analyzer().get_file_history(file_name, start_date, end_date, limit)
+    return jsonify([{
+        'timestamp': event['timestamp'].isoformat() if event['timestamp'] else None,
+        'level': event['level'],
+        'event': event['event'],
+        'message': event['message'],
+        'offset': event['offset']
+    } for event in history])
 
 
 def setup_templates():
@@ -386,7 +926,7 @@ if __name__ == '__main__':
     print("🌐 Starting File Integrity Monitor Web Dashboard")
     print("="*60)
     print("\n📍 Dashboard URL: http://localhost:5000")
-    print("🔄 Auto-refresh: Every 30 seconds")
+    print("🔄 Live updates: Server-Sent Events (/api/events)")
     print("\nPress Ctrl+C to stop the server\n")
     
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file